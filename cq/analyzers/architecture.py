@@ -2,12 +2,18 @@
 from __future__ import annotations
 
 import ast
-from dataclasses import dataclass
+from concurrent.futures import Executor
+from dataclasses import astuple, dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 from ..config import ArchConfig
 from ..utils.ast_tools import iter_imports, safe_parse
+from ..utils.cache import ResultCache, map_cached
+
+# Path characters are never empty, so the empty string can mark a trie node's layer.
+_LAYER_KEY = ""
 
 
 @dataclass
@@ -21,43 +27,97 @@ class ArchitectureViolation:
 class ArchitectureAnalyzer:
     def __init__(self, config: ArchConfig) -> None:
         self.config = config
-        self.sorted_prefixes = sorted(config.mapping.items(), key=lambda kv: len(kv[0]), reverse=True)
+        self._prefix_trie = _build_prefix_trie(config.mapping)
 
-    def analyze(self, files: Dict[str, str]) -> List[ArchitectureViolation]:
+    def analyze(
+        self,
+        files: Dict[str, str],
+        trees: Optional[Mapping[str, ast.AST]] = None,
+        executor: Optional[Executor] = None,
+        cache: Optional[ResultCache] = None,
+    ) -> List[ArchitectureViolation]:
         violations: List[ArchitectureViolation] = []
-        for path, source in files.items():
-            tree, success = safe_parse(source)
-            if not success or tree is None:
-                continue
-            from_layer = self._layer_for_path(path)
-            if from_layer is None:
-                continue
-            for full_name, root in iter_imports(tree):
-                target_layer = self._layer_for_module(full_name or root)
-                if target_layer is None:
-                    continue
-                if [from_layer, target_layer] not in self.config.allowed_edges:
-                    violations.append(
-                        ArchitectureViolation(
-                            file=path,
-                            from_layer=from_layer,
-                            to_layer=target_layer,
-                            import_name=full_name,
-                        )
-                    )
+        file_trees = [trees.get(path) for path in files] if trees else [None] * len(files)
+        per_file = map_cached(
+            cache,
+            "architecture",
+            files,
+            executor,
+            partial(_analyze_one, self),
+            files.keys(),
+            files.values(),
+            file_trees,
+            encode=_encode_violations,
+            decode=_decode_violations,
+        )
+        for file_violations in per_file:
+            violations.extend(file_violations)
         return violations
 
     def _layer_for_path(self, path: str) -> str | None:
-        normalized = path.replace("\\", "/")
-        for prefix, layer in self.sorted_prefixes:
-            if normalized.startswith(prefix):
-                return layer
-        return None
+        return self._longest_prefix_layer(path.replace("\\", "/"))
 
     def _layer_for_module(self, module: str) -> str | None:
-        normalized = module.replace(".", "/")
-        for prefix, layer in self.sorted_prefixes:
-            if normalized.startswith(prefix):
-                return layer
-        return None
+        return self._longest_prefix_layer(module.replace(".", "/"))
+
+    def _longest_prefix_layer(self, normalized: str) -> str | None:
+        # Walk the character trie once; the deepest layer seen belongs to the longest prefix.
+        node = self._prefix_trie
+        layer = node.get(_LAYER_KEY)
+        for char in normalized:
+            child = node.get(char)
+            if child is None:
+                break
+            node = child
+            layer = node.get(_LAYER_KEY, layer)
+        return layer
+
+
+def _build_prefix_trie(mapping: Mapping[str, str]) -> Dict[str, Any]:
+    root: Dict[str, Any] = {}
+    for prefix, layer in mapping.items():
+        node = root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[_LAYER_KEY] = layer
+    return root
+
+
+def _analyze_one(
+    analyzer: ArchitectureAnalyzer, path: str, source: str, tree: Optional[ast.AST] = None
+) -> List[ArchitectureViolation]:
+    violations: List[ArchitectureViolation] = []
+    if tree is None:
+        tree, success = safe_parse(source)
+        if not success or tree is None:
+            return violations
+    from_layer = analyzer._layer_for_path(path)
+    if from_layer is None:
+        return violations
+    for full_name, root in iter_imports(tree):
+        target_layer = analyzer._layer_for_module(full_name or root)
+        if target_layer is None:
+            continue
+        if [from_layer, target_layer] not in analyzer.config.allowed_edges:
+            violations.append(
+                ArchitectureViolation(
+                    file=path,
+                    from_layer=from_layer,
+                    to_layer=target_layer,
+                    import_name=full_name,
+                )
+            )
+    return violations
+
+
+def _encode_violations(violations: List[ArchitectureViolation]) -> List[List[str]]:
+    return [list(astuple(violation)) for violation in violations]
+
 
+def _decode_violations(rows: List[List[str]]) -> List[ArchitectureViolation]:
+    violations = []
+    for row in rows:
+        if not all(isinstance(field, str) for field in row):
+            raise ValueError(f"malformed cached violation: {row!r}")
+        violations.append(ArchitectureViolation(*row))
+    return violations
@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import ast
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Dict, Iterable, Tuple
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type
 
 from ..config import Config
 from ..utils.ast_tools import safe_parse
+from ..utils.cache import ResultCache, map_cached
 
 
 @dataclass
@@ -27,108 +30,158 @@ class ComplexityAnalyzer:
     def __init__(self, config: Config) -> None:
         self.config = config
 
-    def analyze(self, sources: Dict[str, str], loc_map: Dict[str, int]) -> ComplexityResult:
+    def analyze(
+        self,
+        sources: Dict[str, str],
+        loc_map: Dict[str, int],
+        trees: Optional[Mapping[str, ast.AST]] = None,
+        executor: Optional[Executor] = None,
+        cache: Optional[ResultCache] = None,
+    ) -> ComplexityResult:
         scores: Dict[str, float] = {}
         raw: Dict[str, int] = {}
         per_loc: Dict[str, float] = {}
-        for path, source in sources.items():
-            tree, success = safe_parse(source)
-            if not success or tree is None:
+        file_trees = [trees.get(path) for path in sources] if trees else [None] * len(sources)
+        per_file = map_cached(
+            cache,
+            "complexity",
+            sources,
+            executor,
+            partial(_analyze_one, self),
+            sources.values(),
+            file_trees,
+            decode=_decode_complexity,
+        )
+        target = max(self.config.scoring.complexity_scale.target_per_loc, 1e-6)
+        hard_cap = self.config.scoring.complexity_scale.hard_cap
+        for path, complexity in zip(sources.keys(), per_file):
+            if complexity is None:
                 raw[path] = 0
                 per_loc[path] = 0.0
                 scores[path] = 100.0
                 continue
-            complexity = self._compute(tree)
             raw[path] = complexity
-            loc = max(1, loc_map.get(path, 1))
-            per = complexity / loc
+            per = complexity / max(1, loc_map.get(path, 1))
             per_loc[path] = per
-            target = self.config.scoring.complexity_scale.target_per_loc
-            hard_cap = self.config.scoring.complexity_scale.hard_cap
             if complexity >= hard_cap:
-                score = 0.0
+                scores[path] = 0.0
             else:
-                ratio = min(1.0, per / max(target, 1e-6))
-                score = max(0.0, 100.0 * (1 - ratio))
-            scores[path] = score
+                scores[path] = max(0.0, 100.0 * (1 - min(1.0, per / target)))
         return ComplexityResult(scores=scores, raw=raw, per_loc=per_loc)
 
     def _compute(self, tree: ast.AST) -> int:
         complexity = 0
-        stack: list[int] = []
-
-        def enter(extra: int = 1) -> None:
-            nonlocal complexity
-            complexity += extra + len(stack)
-            stack.append(1)
-
-        def leave() -> None:
-            if stack:
-                stack.pop()
-
-        class Visitor(ast.NodeVisitor):
-            def visit_If(self, node: ast.If) -> None:  # noqa: N802
-                enter()
-                for idx, test in enumerate(node.orelse):
-                    if isinstance(test, ast.If):
-                        enter()
-                        self.generic_visit(test)
-                        leave()
-                self.generic_visit(node.test)
-                for child in node.body:
-                    self.visit(child)
-                for child in node.orelse:
-                    if not isinstance(child, ast.If):
-                        self.visit(child)
-                leave()
-
-            def visit_For(self, node: ast.For) -> None:  # noqa: N802
-                enter()
-                self.generic_visit(node)
-                leave()
-
-            visit_AsyncFor = visit_For  # type: ignore
-
-            def visit_While(self, node: ast.While) -> None:  # noqa: N802
-                enter()
-                self.generic_visit(node)
-                leave()
-
-            def visit_With(self, node: ast.With) -> None:  # noqa: N802
-                enter()
-                self.generic_visit(node)
-                leave()
-
-            visit_AsyncWith = visit_With  # type: ignore
-
-            def visit_Try(self, node: ast.Try) -> None:  # noqa: N802
-                enter()
-                for handler in node.handlers:
-                    enter()
-                    self.generic_visit(handler)
-                    leave()
-                if node.finalbody:
-                    enter()
-                    for child in node.finalbody:
-                        self.visit(child)
-                    leave()
-                for child in node.body:
-                    self.visit(child)
-                for child in node.orelse:
-                    self.visit(child)
-                leave()
-
-            def visit_BoolOp(self, node: ast.BoolOp) -> None:  # noqa: N802
-                nonlocal complexity
-                complexity += max(0, len(node.values) - 1)
-                self.generic_visit(node)
-
-            def visit_Return(self, node: ast.Return) -> None:  # noqa: N802
-                nonlocal complexity
-                complexity += 1
-                self.generic_visit(node)
-
-        Visitor().visit(tree)
-        stack.clear()
+        stack: List[_Frame] = [(tree, 0)]
+        while stack:
+            node, depth = stack.pop()
+            handler = _HANDLERS.get(type(node))
+            if handler is None:
+                _push_children(node, depth, stack)
+            else:
+                complexity += handler(node, depth, stack)
         return complexity
 
+
+# Each handler returns the increment for ``node`` at nesting ``depth`` and pushes the nodes to
+# visit next, with their own nesting depth, onto the explicit stack.
+_Frame = Tuple[ast.AST, int]
+
+
+def _push_children(node: ast.AST, depth: int, stack: List[_Frame]) -> None:
+    # Inlined ast.iter_child_nodes without the nested generators; expression contexts
+    # (Load/Store/Del) never affect the score and are skipped.
+    for name in _child_fields(type(node)):
+        value = getattr(node, name, None)
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, ast.AST):
+                    stack.append((item, depth))
+        elif isinstance(value, ast.AST):
+            stack.append((value, depth))
+
+
+# Node class -> its fields minus ``ctx``; filled on first sight of each class.
+_CHILD_FIELDS: Dict[Type[ast.AST], Tuple[str, ...]] = {}
+
+
+def _child_fields(node_type: Type[ast.AST]) -> Tuple[str, ...]:
+    fields = _CHILD_FIELDS.get(node_type)
+    if fields is None:
+        fields = _CHILD_FIELDS[node_type] = tuple(
+            name for name in node_type._fields if name != "ctx"
+        )
+    return fields
+
+
+def _h_nesting(node: ast.AST, depth: int, stack: List[_Frame]) -> int:
+    _push_children(node, depth + 1, stack)
+    return 1 + depth
+
+
+def _h_if(node: ast.If, depth: int, stack: List[_Frame]) -> int:
+    complexity = 1 + depth
+    inner = depth + 1
+    for child in node.orelse:
+        if isinstance(child, ast.If):
+            # An elif counts as its own nested branch.
+            complexity += 1 + inner
+            _push_children(child, inner + 1, stack)
+        else:
+            stack.append((child, inner))
+    # Only the operands of the condition are visited, not the condition node itself.
+    _push_children(node.test, inner, stack)
+    stack.extend((child, inner) for child in node.body)
+    return complexity
+
+
+def _h_try(node: ast.Try, depth: int, stack: List[_Frame]) -> int:
+    complexity = 1 + depth
+    inner = depth + 1
+    for handler in node.handlers:
+        complexity += 1 + inner
+        _push_children(handler, inner + 1, stack)
+    if node.finalbody:
+        complexity += 1 + inner
+        stack.extend((child, inner + 1) for child in node.finalbody)
+    stack.extend((child, inner) for child in node.body)
+    stack.extend((child, inner) for child in node.orelse)
+    return complexity
+
+
+def _h_bool_op(node: ast.BoolOp, depth: int, stack: List[_Frame]) -> int:
+    _push_children(node, depth, stack)
+    return max(0, len(node.values) - 1)
+
+
+def _h_return(node: ast.Return, depth: int, stack: List[_Frame]) -> int:
+    _push_children(node, depth, stack)
+    return 1
+
+
+_HANDLERS: Dict[Type[ast.AST], Callable[[Any, int, List[_Frame]], int]] = {
+    ast.If: _h_if,
+    ast.For: _h_nesting,
+    ast.AsyncFor: _h_nesting,
+    ast.While: _h_nesting,
+    ast.With: _h_nesting,
+    ast.AsyncWith: _h_nesting,
+    ast.Try: _h_try,
+    ast.BoolOp: _h_bool_op,
+    ast.Return: _h_return,
+}
+
+
+def _analyze_one(
+    analyzer: ComplexityAnalyzer, source: str, tree: Optional[ast.AST] = None
+) -> Optional[int]:
+    if tree is None:
+        tree, success = safe_parse(source)
+        if not success or tree is None:
+            return None
+    return analyzer._compute(tree)
+
+
+def _decode_complexity(value: object) -> Optional[int]:
+    if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+        return value
+    raise ValueError(f"malformed cached complexity: {value!r}")
@@ -1,18 +1,39 @@
 """Duplication analysis via winnowing."""
 from __future__ import annotations
 
-import ast
 import hashlib
+import keyword
+import re
+import sys
+import tokenize
+from array import array
+from collections import Counter, deque
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence, Tuple
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, cast
 
 from ..config import DuplicationConfig
-from ..utils.ast_tools import NormalizingTransformer, safe_parse
+from ..utils import file_scan
+from ..utils.cache import ResultCache, map_cached
+from ..utils.file_scan import FileScan
+
+# From "#" to the end of the line, using the same line boundaries as str.splitlines().
+_COMMENT_RE = re.compile(r"#[^\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]*")
+# f-string bodies are tokenized separately (FSTRING_MIDDLE) from Python 3.12 on.
+_LITERAL_TOKENS = frozenset(
+    {tokenize.STRING, tokenize.NUMBER, getattr(tokenize, "FSTRING_MIDDLE", tokenize.STRING)}
+)
+_LITERAL_NAMES = frozenset({"True", "False", "None"})
+_LITERAL_PLACEHOLDER = "CONST"
+_HASH_BASE = 1_000_003
+_HASH_MASK = (1 << 64) - 1
 
 
 @dataclass
 class DuplicationResult:
-    fingerprints: Dict[str, List[int]]
+    fingerprints: Dict[str, array[int]]
     ratios: Dict[str, float]
     parser_success: Dict[str, bool]
 
@@ -21,89 +42,160 @@ class DuplicationAnalyzer:
     def __init__(self, config: DuplicationConfig) -> None:
         self.config = config
 
-    def analyze(self, sources: Dict[str, str]) -> DuplicationResult:
-        normalized: Dict[str, List[str]] = {}
+    def analyze(
+        self,
+        sources: Dict[str, str],
+        executor: Optional[Executor] = None,
+        cache: Optional[ResultCache] = None,
+        scans: Optional[Mapping[str, FileScan]] = None,
+    ) -> DuplicationResult:
+        fingerprints: Dict[str, array[int]] = {}
         parser_success: Dict[str, bool] = {}
+        # Identical sources (empty __init__.py files, vendored copies) normalize to the same
+        # fingerprints, so each distinct text is analyzed once, under its first path.
+        first_paths: Dict[str, str] = {}
+        for path, text in sources.items():
+            first_paths.setdefault(text, path)
+        unique = {path: text for text, path in first_paths.items()}
+        file_scans = [scans.get(path) for path in unique] if scans else [None] * len(unique)
+        per_text = map_cached(
+            cache,
+            "duplication",
+            unique,
+            executor,
+            partial(_analyze_one, self),
+            unique.values(),
+            file_scans,
+            encode=_encode_result,
+            decode=_decode_result,
+        )
+        results = dict(zip(unique.values(), per_text))
         for path, text in sources.items():
-            norm_tokens, success = self._normalize(text)
-            normalized[path] = norm_tokens
-            parser_success[path] = success
-        fingerprints = {
-            path: self._fingerprints(tokens) for path, tokens in normalized.items()
-        }
+            fingerprints[path], parser_success[path] = results[text]
         ratios = self._compute_ratios(fingerprints)
         return DuplicationResult(fingerprints=fingerprints, ratios=ratios, parser_success=parser_success)
 
-    def _normalize(self, text: str) -> Tuple[List[str], bool]:
-        tree, success = safe_parse(text)
-        if success and tree is not None and self.config.normalize.get("strip_literals", True):
-            transformer = NormalizingTransformer(
-                identifier_placeholder=str(
-                    self.config.normalize.get("identifier_placeholder", "ID")
-                )
-            )
-            tree = transformer.visit(tree)
-            ast.fix_missing_locations(tree)
-            normalized = ast.unparse(tree)
-        else:
-            normalized = text
-        if self.config.normalize.get("strip_comments", True):
-            normalized = self._strip_comments(normalized)
-        tokens = normalized.split()
-        return tokens, success
+    def _normalize(self, text: str, scan: Optional[FileScan] = None) -> Tuple[List[str], bool]:
+        """Return the normalized token stream of ``text`` and whether it tokenized cleanly.
 
-    def _strip_comments(self, text: str) -> str:
-        lines = []
-        for line in text.splitlines():
-            if line.strip().startswith("#"):
+        Tokens come from ``scan`` (scanned here when not given): identifiers become the
+        placeholder and literals become ``CONST``. Sources that cannot be tokenized fall back
+        to whitespace splitting.
+        """
+        if scan is None:
+            scan = file_scan.scan(text)
+        strip_comments = bool(self.config.normalize.get("strip_comments", True))
+        if not scan.success:
+            normalized = self._strip_comments(text) if strip_comments else text
+            return normalized.split(), False
+        strip_literals = bool(self.config.normalize.get("strip_literals", True))
+        # Interned so every placeholder token is one object and _token_hash hits by identity.
+        placeholder = sys.intern(str(self.config.normalize.get("identifier_placeholder", "ID")))
+        tokens: List[str] = []
+        for kind, string in scan.tokens:
+            if kind == tokenize.COMMENT:
+                if not strip_comments:
+                    tokens.append(string)
                 continue
-            if "#" in line:
-                idx = line.index("#")
-                line = line[:idx]
-            lines.append(line)
-        return "\n".join(lines)
+            if strip_literals:
+                if kind in _LITERAL_TOKENS or string in _LITERAL_NAMES:
+                    tokens.append(_LITERAL_PLACEHOLDER)
+                    continue
+                if kind == tokenize.NAME and not keyword.iskeyword(string):
+                    tokens.append(placeholder)
+                    continue
+            tokens.append(string)
+        return tokens, True
 
-    def _fingerprints(self, tokens: Sequence[str]) -> List[int]:
+    def _strip_comments(self, text: str) -> str:
+        return _COMMENT_RE.sub("", text)
+
+    def _fingerprints(self, tokens: Sequence[str]) -> array[int]:
+        """Winnow ``tokens`` into a sorted, duplicate-free array of unsigned 64-bit hashes.
+
+        The array form is compact to pickle between processes and to store in the cache.
+        """
         k = max(1, self.config.k)
         w = max(1, self.config.w)
         if len(tokens) < k:
             if not tokens:
-                return []
-            return [_stable_hash(" ".join(tokens))]
+                return array("Q")
+            return array("Q", [_stable_hash(" ".join(tokens))])
         hashes: List[int] = []
-        window: List[Tuple[int, int]] = []  # (hash, position)
-        min_hash = None
+        # Monotonic deque of (hash, position) candidates: hashes increase from left to right,
+        # so the window minimum is always at the front and each k-gram is pushed/popped once.
+        window: Deque[Tuple[int, int]] = deque()
         min_pos = None
-        for i in range(len(tokens) - k + 1):
-            kgram = tokens[i : i + k]
-            hash_val = _stable_hash(" ".join(kgram))
+        for i, hash_val in enumerate(_kgram_hashes(tokens, k)):
+            while window and window[-1][0] > hash_val:
+                window.pop()
             window.append((hash_val, i))
-            if len(window) > w:
-                window.pop(0)
-            current_min = min(window, key=lambda x: (x[0], x[1]))
-            if (min_hash, min_pos) != current_min:
-                min_hash, min_pos = current_min
-                hashes.append(current_min[0])
-        return hashes
-
-    def _compute_ratios(self, fingerprints: Dict[str, List[int]]) -> Dict[str, float]:
+            if window[0][1] <= i - w:
+                window.popleft()
+            current_hash, current_pos = window[0]
+            if current_pos != min_pos:
+                min_pos = current_pos
+                hashes.append(current_hash)
+        return array("Q", sorted(set(hashes)))
+
+    def _compute_ratios(self, fingerprints: Dict[str, array[int]]) -> Dict[str, float]:
+        # Inverted index: fingerprint -> number of files containing it. Each file's overlap
+        # with every other file is then a sum over its own fingerprints, with no pairwise pass.
+        # Fingerprints are already unique per file, so they are counted without building sets.
+        index = Counter(chain.from_iterable(fingerprints.values()))
         ratio: Dict[str, float] = {}
-        items = list(fingerprints.items())
-        for path, fprints in items:
+        for path, fprints in fingerprints.items():
             if not fprints:
                 ratio[path] = 0.0
                 continue
-            overlaps = 0
-            set_self = set(fprints)
-            for other_path, other_fprints in items:
-                if other_path == path:
-                    continue
-                overlaps += len(set_self.intersection(other_fprints))
-            ratio[path] = min(1.0, overlaps / max(1, len(set_self)))
+            overlaps = sum(index[fprint] for fprint in fprints) - len(fprints)
+            ratio[path] = min(1.0, overlaps / len(fprints))
         return ratio
 
 
+def _analyze_one(
+    analyzer: DuplicationAnalyzer, text: str, scan: Optional[FileScan] = None
+) -> Tuple[array[int], bool]:
+    tokens, success = analyzer._normalize(text, scan)
+    return analyzer._fingerprints(tokens), success
+
+
+def _encode_result(result: Tuple[array[int], bool]) -> List[object]:
+    fprints, success = result
+    return [fprints.tolist(), success]
+
+
+def _decode_result(value: List[object]) -> Tuple[array[int], bool]:
+    fprints, success = cast(Tuple[List[int], bool], value)
+    return array("Q", fprints), bool(success)
+
+
+def _kgram_hashes(tokens: Sequence[str], k: int) -> List[int]:
+    """Return a Rabin-Karp rolling hash for every k-gram of ``tokens``.
+
+    Each token is hashed once; sliding the window costs a constant number of integer
+    operations instead of re-hashing all ``k`` tokens of the next k-gram.
+    """
+    token_hashes = [_token_hash(token) for token in tokens]
+    drop = pow(_HASH_BASE, k - 1, _HASH_MASK + 1)
+    current = 0
+    for value in token_hashes[:k]:
+        current = (current * _HASH_BASE + value) & _HASH_MASK
+    hashes = [current]
+    for i in range(len(token_hashes) - k):
+        current = (
+            (current - token_hashes[i] * drop) * _HASH_BASE + token_hashes[i + k]
+        ) & _HASH_MASK
+        hashes.append(current)
+    return hashes
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+    return _stable_hash(token)
+
+
 def _stable_hash(text: str) -> int:
-    digest = hashlib.md5(text.encode("utf-8")).hexdigest()
-    return int(digest[:8], 16)
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
 
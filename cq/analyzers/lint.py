@@ -1,13 +1,18 @@
 """Lint analysis using pylint."""
 from __future__ import annotations
 
+import io
 import json
 import subprocess
-from collections import defaultdict
+import tempfile
+import threading
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple
 
 from ..config import Config
+from ..utils.parallel import worker_count
+
+_BASE_CATEGORIES = ("C", "W", "R", "E")
 
 
 @dataclass
@@ -23,50 +28,139 @@ class LintAnalyzer:
         self.config = config
 
     def analyze(self, files: Iterable[str]) -> LintResult:
-        pylint_cmd = [self.config.tools.pylint_cmd, "--output-format=json", *files]
-        counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"C": 0, "W": 0, "R": 0, "E": 0})
-        weighted_scores: Dict[str, float] = {}
+        pylint_cmd = [
+            self.config.tools.pylint_cmd,
+            "--output-format=json",
+            f"--jobs={worker_count(self.config.tools.jobs)}",
+            *files,
+        ]
+        # Counts are kept column-wise: one row per path, one list of counts per category.
+        rows: Dict[str, int] = {}
+        columns: Dict[str, List[int]] = {cat: [] for cat in _BASE_CATEGORIES}
         degraded = False
         missing_reason: str | None = None
-        try:
-            completed = subprocess.run(
-                pylint_cmd,
-                capture_output=True,
-                check=False,
-                text=True,
-                timeout=self.config.tools.timeouts.get("pylint", 90),
-            )
-        except (OSError, subprocess.TimeoutExpired) as exc:  # pragma: no cover - error path
+        timeout = self.config.tools.timeouts.get("pylint", 90)
+        with tempfile.TemporaryFile() as stderr:
+            try:
+                proc = subprocess.Popen(pylint_cmd, stdout=subprocess.PIPE, stderr=stderr, text=True)
+            except OSError as exc:  # pragma: no cover - error path
+                degraded = True
+                missing_reason = f"pylint unavailable: {exc}"
+                return LintResult(counts={}, weighted_scores={}, degraded=degraded, missing_reason=missing_reason)
+            stdout = proc.stdout
+            assert stdout is not None  # opened with stdout=PIPE
+            timed_out = threading.Event()
+
+            def _kill() -> None:
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(timeout, _kill)
+            timer.daemon = True
+            timer.start()
+            parse_error: ValueError | None = None
+            try:
+                # Count messages as pylint emits them instead of buffering its whole output.
+                for message in _iter_json_array(stdout):
+                    path = message.get("path")
+                    msg_id = message.get("symbol") or ""
+                    category = msg_id[:1].upper() if msg_id else message.get("type", "").upper()[:1]
+                    row = rows.get(path)
+                    if row is None:
+                        row = rows[path] = len(rows)
+                        for existing in columns.values():
+                            existing.append(0)
+                    column = columns.get(category)
+                    if column is None:
+                        column = columns[category] = [0] * len(rows)
+                    column[row] += 1
+            except ValueError as exc:
+                parse_error = exc
+            finally:
+                stdout.close()
+                returncode = proc.wait()
+                timer.cancel()
+            stderr_tail = _read_tail(stderr)
+
+        if timed_out.is_set():  # pragma: no cover - error path
             degraded = True
-            missing_reason = f"pylint unavailable: {exc}"
+            missing_reason = f"pylint unavailable: timed out after {timeout} seconds"
             return LintResult(counts={}, weighted_scores={}, degraded=degraded, missing_reason=missing_reason)
 
-        if completed.returncode not in (0, 2, 4, 8, 16, 32):
+        if returncode not in (0, 2, 4, 8, 16, 32):
             degraded = True
-            missing_reason = completed.stderr.strip() or "pylint run failed"
+            missing_reason = stderr_tail or "pylint run failed"
             return LintResult(counts={}, weighted_scores={}, degraded=degraded, missing_reason=missing_reason)
 
-        try:
-            messages = json.loads(completed.stdout or "[]")
-        except json.JSONDecodeError:
+        if parse_error is not None:
             degraded = True
             missing_reason = "pylint produced invalid JSON"
             return LintResult(counts={}, weighted_scores={}, degraded=degraded, missing_reason=missing_reason)
 
-        for message in messages:
-            path = message.get("path")
-            msg_id = message.get("symbol") or ""
-            category = msg_id[:1].upper() if msg_id else message.get("type", "").upper()[:1]
-            if category not in counts[path]:
-                counts[path][category] = 0
-            counts[path][category] += 1
-
         weights = self.config.weights["pylint_categories"]
-        for path, cat_counts in counts.items():
-            total = 0.0
-            for cat, count in cat_counts.items():
-                weight = weights.get(cat, 0.0)
-                total += weight * count
-            weighted_scores[path] = max(0.0, 100.0 - total)
-        return LintResult(counts=dict(counts), weighted_scores=weighted_scores, degraded=degraded, missing_reason=missing_reason)
+        totals = [0.0] * len(rows)
+        for cat, column in columns.items():
+            weight = weights.get(cat, 0.0)
+            if weight:
+                totals = [total + weight * count for total, count in zip(totals, column)]
+        weighted_scores = {path: max(0.0, 100.0 - totals[row]) for path, row in rows.items()}
+        counts = {
+            path: {
+                cat: column[row]
+                for cat, column in columns.items()
+                if column[row] or cat in _BASE_CATEGORIES
+            }
+            for path, row in rows.items()
+        }
+        return LintResult(counts=counts, weighted_scores=weighted_scores, degraded=degraded, missing_reason=missing_reason)
+
+
+def _iter_json_array(stream: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array as they are read from ``stream``.
+
+    Only one chunk plus the item being decoded is held in memory. Empty input is treated as
+    an empty array; anything else that is not an array raises ``ValueError``.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # An item ending exactly at the buffer edge may be a truncated scalar.
+                if end < len(buffer) or eof:
+                    yield item
+                    pos = end
+                    continue
+        elif eof:
+            if started:
+                raise ValueError("unterminated JSON array")
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _read_tail(stream: IO[bytes], limit: int = 4096) -> str:
+    stream.seek(0, io.SEEK_END)
+    stream.seek(max(0, stream.tell() - limit))
+    return stream.read().decode("utf-8", errors="replace").strip()
 
@@ -5,11 +5,16 @@ import re
 import subprocess
 from collections import defaultdict
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
 
 from ..config import Config
 
-MYPY_ERROR_RE = re.compile(r"^(?P<path>[^:]+):(?P<line>\d+): (?P<type>error|note): (?P<message>.+)$")
+# Matched directly against mypy's raw stdout bytes, one report line at a time.
+MYPY_ERROR_RE = re.compile(
+    rb"^(?P<path>[^:\r\n]+):(?P<line>\d+): (?P<type>error|note): (?P<message>[^\r\n]+)\r?$",
+    re.MULTILINE,
+)
 
 
 @dataclass
@@ -26,14 +31,19 @@ class TypingAnalyzer:
         self.config = config
 
     def analyze(self, files: Iterable[str], loc_map: Dict[str, int], coverage: Dict[str, float]) -> TypingResult:
+        mypy_cmd = self.config.tools.mypy_cmd
         cmd = [
-            self.config.tools.mypy_cmd,
+            mypy_cmd,
             "--hide-error-context",
             "--no-color-output",
             "--no-error-summary",
             "--show-error-codes",
             *files,
         ]
+        if Path(mypy_cmd).stem == "dmypy":
+            # The daemon keeps mypy's caches warm between scans; `dmypy run` starts it on
+            # first use and forwards everything after `--` to the type checker.
+            cmd[1:1] = ["run", "--"]
         errors: Dict[str, int] = defaultdict(int)
         degraded = False
         missing_reason: str | None = None
@@ -42,7 +52,6 @@ class TypingAnalyzer:
                 cmd,
                 capture_output=True,
                 check=False,
-                text=True,
                 timeout=self.config.tools.timeouts.get("mypy", 120),
             )
         except (OSError, subprocess.TimeoutExpired) as exc:  # pragma: no cover - error path
@@ -52,25 +61,25 @@ class TypingAnalyzer:
 
         if completed.returncode not in (0, 1):
             degraded = True
-            missing_reason = completed.stderr.strip() or "mypy run failed"
+            missing_reason = completed.stderr.decode("utf-8", errors="replace").strip() or "mypy run failed"
             return TypingResult(errors={}, scores={}, coverage=coverage, degraded=degraded, missing_reason=missing_reason)
 
-        for line in completed.stdout.splitlines():
-            match = MYPY_ERROR_RE.match(line)
-            if match and match.group("type") == "error":
-                path = match.group("path")
-                errors[path] += 1
+        raw_errors: Dict[bytes, int] = defaultdict(int)
+        for match in MYPY_ERROR_RE.finditer(completed.stdout):
+            if match.group("type") == b"error":
+                raw_errors[match.group("path")] += 1
+        for raw_path, count in raw_errors.items():
+            errors[raw_path.decode("utf-8", errors="replace")] += count
 
         scores: Dict[str, float] = {}
+        max_score = self.config.scoring.typing_error_scale.max_score_at_0
+        zero_score_at = self.config.scoring.typing_error_scale.zero_score_at_20
+        slope = max_score / zero_score_at if zero_score_at else 0.0
         for path, loc in loc_map.items():
-            err_count = errors.get(path, 0)
-            density = err_count * 1000 / max(1, loc)
-            max_score = self.config.scoring.typing_error_scale.max_score_at_0
-            zero_score_at = self.config.scoring.typing_error_scale.zero_score_at_20
+            density = errors.get(path, 0) * 1000 / max(1, loc)
             if density >= zero_score_at:
-                score = 0.0
+                scores[path] = 0.0
             else:
-                score = max(0.0, max_score - (max_score / zero_score_at) * density)
-            scores[path] = score
+                scores[path] = max(0.0, max_score - slope * density)
         return TypingResult(errors=dict(errors), scores=scores, coverage=coverage, degraded=degraded, missing_reason=missing_reason)
 
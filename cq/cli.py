@@ -22,7 +22,15 @@ def build_parser() -> argparse.ArgumentParser:
     scan.add_argument("--config", default=None, help="Path to cq.yml config")
     scan.add_argument("--format", default="both", choices=["json", "md", "both"], help="Report formats")
     scan.add_argument("--out", default=None, help="Output directory")
-    scan.add_argument("--jobs", default=1, type=int, help="Parallel jobs (unused)")
+    scan.add_argument(
+        "--jobs",
+        default=None,
+        type=int,
+        help="Parallel worker processes (0 = one per CPU minus one; default from config)",
+    )
+    scan.add_argument(
+        "--no-cache", action="store_true", help="Ignore and do not update the result cache"
+    )
 
     subparsers.add_parser("print-schema", help="Print JSON schema")
     subparsers.add_parser("example-config", help="Print default configuration")
@@ -48,6 +56,10 @@ def main(argv: Iterable[str] | None = None) -> int:
     if args.command == "scan":
         config_path = Path(args.config) if args.config else None
         config = Config.load(config_path)
+        if args.jobs is not None:
+            config.tools.jobs = args.jobs
+        if args.no_cache:
+            config.cache.enabled = False
         runner = Runner(config)
         root_path = Path(args.path).resolve()
         report, errors = runner.run(root_path)
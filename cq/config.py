@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Mapping, Optional
 
 try:  # pragma: no cover - optional dependency
@@ -48,6 +49,7 @@ DEFAULT_CONFIG = {
     "tools": {
         "pylint_cmd": "pylint",
         "mypy_cmd": "mypy",
+        "jobs": 1,
         "timeouts": {"pylint": 90, "mypy": 120},
     },
     "duplication": {
@@ -65,9 +67,23 @@ DEFAULT_CONFIG = {
         "typing_error_scale": {"per_1k_loc": {"max_score_at_0": 100, "zero_score_at_20": 0}},
     },
     "report": {"format": ["json", "md"], "out_dir": ".cq-out"},
+    "cache": {"enabled": True, "dir": ".cq-cache"},
 }
 
 
+def _freeze(value: object) -> object:
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+# Read-only view of the defaults; ``from_dict`` copies whatever it keeps, so the view is
+# merged into directly instead of being copied on every load.
+_FROZEN_DEFAULT: Mapping[str, object] = MappingProxyType(
+    {key: _freeze(value) for key, value in DEFAULT_CONFIG.items()}
+)
+
+
 @dataclass
 class PathsConfig:
     include: List[str]
@@ -86,6 +102,7 @@ class ToolsConfig:
     pylint_cmd: str
     mypy_cmd: str
     timeouts: Dict[str, int]
+    jobs: int = 1
 
 
 @dataclass
@@ -125,6 +142,12 @@ class ReportConfig:
     out_dir: str
 
 
+@dataclass
+class CacheConfig:
+    enabled: bool
+    dir: str
+
+
 @dataclass
 class Config:
     paths: PathsConfig
@@ -135,10 +158,11 @@ class Config:
     bootstrap: BootstrapConfig
     scoring: ScoringConfig
     report: ReportConfig
+    cache: CacheConfig
 
     @classmethod
     def from_dict(cls, data: Mapping[str, object]) -> "Config":
-        merged = _deep_merge(DEFAULT_CONFIG, data)
+        merged = _deep_merge(_FROZEN_DEFAULT, data)
         paths = merged["paths"]
         arch = merged["arch"]
         weights = merged["weights"]
@@ -147,6 +171,7 @@ class Config:
         bootstrap = merged["bootstrap"]
         scoring = merged["scoring"]
         report = merged["report"]
+        cache = merged["cache"]
         return cls(
             paths=PathsConfig(list(paths["include"]), list(paths["exclude"])),
             arch=ArchConfig(list(arch["layers"]), dict(arch["map"]), list(arch["allowed_edges"])),
@@ -155,6 +180,7 @@ class Config:
                 pylint_cmd=str(tools["pylint_cmd"]),
                 mypy_cmd=str(tools["mypy_cmd"]),
                 timeouts={k: int(v) for k, v in tools["timeouts"].items()},
+                jobs=int(tools["jobs"]),
             ),
             duplication=DuplicationConfig(
                 k=int(duplication["k"]),
@@ -180,6 +206,7 @@ class Config:
                 ),
             ),
             report=ReportConfig(format=list(report["format"]), out_dir=str(report["out_dir"])),
+            cache=CacheConfig(enabled=bool(cache["enabled"]), dir=str(cache["dir"])),
         )
 
     @classmethod
@@ -191,10 +218,10 @@ class Config:
         return cls.from_dict(data)
 
 
-def _deep_merge(base: Mapping[str, object], override: Mapping[str, object]) -> Dict[str, object]:
-    result: Dict[str, object] = {}
-    for key, value in base.items():
-        result[key] = value
+def _deep_merge(base: Mapping[str, object], override: Mapping[str, object]) -> Mapping[str, object]:
+    if not override:
+        return base
+    result: Dict[str, object] = dict(base)
     for key, value in override.items():
         if key in result and isinstance(result[key], Mapping) and isinstance(value, Mapping):
             result[key] = _deep_merge(result[key], value)
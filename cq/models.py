@@ -5,6 +5,34 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
 
+@dataclass
+class FileTable:
+    """Per-file scan data stored column-wise; row ``i`` of every column describes ``paths[i]``."""
+
+    paths: List[str] = field(default_factory=list)
+    loc: List[int] = field(default_factory=list)
+    roles: List[str] = field(default_factory=list)
+    parser_success: List[bool] = field(default_factory=list)
+    coverage: List[float] = field(default_factory=list)
+
+    def append(self, path: str, loc: int, role: str, parser_success: bool, coverage: float) -> int:
+        row = len(self.paths)
+        self.paths.append(path)
+        self.loc.append(loc)
+        self.roles.append(role)
+        self.parser_success.append(parser_success)
+        self.coverage.append(coverage)
+        return row
+
+    def loc_by_path(self) -> Dict[str, int]:
+        """Return ``loc`` keyed by path, for analyzers that take mappings."""
+        return dict(zip(self.paths, self.loc))
+
+    def coverage_by_path(self) -> Dict[str, float]:
+        """Return ``coverage`` keyed by path, for analyzers that take mappings."""
+        return dict(zip(self.paths, self.coverage))
+
+
 @dataclass
 class FileMetrics:
     duplication_ratio: float
@@ -5,6 +5,11 @@ import json
 from pathlib import Path
 from typing import Any, Dict
 
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - fallback
+    orjson = None  # type: ignore
+
 from ..models import Report
 from .schema import SCHEMA
 from .validate import validate_dict
@@ -13,7 +18,11 @@ from .validate import validate_dict
 def write_json_report(report: Report, path: Path) -> None:
     data = serialize_report(report)
     validate_dict(data, SCHEMA)
-    path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+        return
+    with path.open("w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2, sort_keys=True)
 
 
 def serialize_report(report: Report) -> Dict[str, Any]:
@@ -3,9 +3,264 @@ from __future__ import annotations
 
 import json
 from importlib import resources
-from typing import Any, Dict
+from numbers import Number
+from typing import Any, Callable, Dict, List, Mapping, Set, Tuple
 
 
 with resources.files(__package__).joinpath("schema.json").open("r", encoding="utf-8") as fh:
     SCHEMA: Dict[str, Any] = json.load(fh)
 
+# The report schema split for incremental validation: the project part without the files
+# array, and the schema each entry of ``files`` must match on its own.
+FILE_SCHEMA: Dict[str, Any] = {
+    "$schema": SCHEMA["$schema"],
+    **SCHEMA["properties"]["files"]["items"],
+}
+PROJECT_SCHEMA: Dict[str, Any] = {
+    **SCHEMA,
+    "required": [key for key in SCHEMA["required"] if key != "files"],
+    "properties": {key: value for key, value in SCHEMA["properties"].items() if key != "files"},
+}
+
+
+class ReportValidationError(ValueError):
+    """Raised by compiled schema validators when an instance does not match."""
+
+
+class _Invalid(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+        self.path: List[str] = []
+
+
+_Check = Callable[[Any], None]
+
+# Keywords that carry no assertion here (jsonschema does not enforce "format" by default).
+_ANNOTATIONS = frozenset({"$schema", "title", "description", "format", "nullable"})
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], None]:
+    """Compile ``schema`` into a validation function built from nested closures.
+
+    Only the keywords used by the report schema are supported; anything else raises at
+    compile time rather than being silently skipped. The returned function raises
+    ``ReportValidationError`` naming the failing location.
+    """
+    check = _compile(schema)
+
+    def validate(instance: Any) -> None:
+        try:
+            check(instance)
+        except _Invalid as exc:
+            location = "".join(reversed(exc.path)) or "<root>"
+            raise ReportValidationError(f"{exc.message} at {location}") from None
+
+    return validate
+
+
+def compile_accessors(
+    schema: Dict[str, Any], accessors: Mapping[Tuple[str, ...], Callable[[Any], Any]]
+) -> Callable[[Any], None]:
+    """Compile a validator for objects whose schema properties are read through ``accessors``.
+
+    ``accessors`` maps property paths (tuples of keys) to getters, so an object such as a
+    dataclass is validated in place instead of first being converted to nested dicts. Every
+    property in ``schema`` must have an accessor or be an object grouping accessor paths.
+    """
+    _check_coverage(schema, (), set(accessors))
+    checks = []
+    for keys, getter in accessors.items():
+        sub = schema
+        for key in keys:
+            sub = sub["properties"][key]
+        checks.append(("." + ".".join(keys), getter, _compile(sub)))
+
+    def validate(instance: Any) -> None:
+        for location, getter, check in checks:
+            try:
+                check(getter(instance))
+            except _Invalid as exc:
+                inner = "".join(reversed(exc.path))
+                raise ReportValidationError(f"{exc.message} at {location}{inner}") from None
+
+    return validate
+
+
+def _check_coverage(
+    schema: Dict[str, Any], prefix: Tuple[str, ...], paths: Set[Tuple[str, ...]]
+) -> None:
+    if prefix in paths:
+        return
+    name = ".".join(prefix) or "<root>"
+    grouping = {"type", "required", "properties"} | _ANNOTATIONS
+    if schema.get("type") != "object" or not set(schema) <= grouping:
+        raise ValueError(f"no accessor for schema property {name}")
+    properties = schema.get("properties", {})
+    for key in schema.get("required", []):
+        if key not in properties:
+            raise ValueError(f"no accessor for required property {key} of {name}")
+    for key, sub in properties.items():
+        _check_coverage(sub, prefix + (key,), paths)
+
+
+def _compile(schema: Dict[str, Any]) -> _Check:
+    checks: List[_Check] = []
+    for keyword in schema:
+        if keyword not in _COMPILERS and keyword not in _ANNOTATIONS:
+            raise ValueError(f"unsupported schema keyword: {keyword}")
+    for keyword, compiler in _COMPILERS.items():
+        if keyword in schema:
+            checks.append(compiler(schema[keyword], schema))
+    if not checks:
+        return _accept
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(instance: Any) -> None:
+        for check in checks:
+            check(instance)
+
+    return check_all
+
+
+def _accept(instance: Any) -> None:
+    return None
+
+
+def _is_number(instance: Any) -> bool:
+    kind = type(instance)
+    if kind is float or kind is int:
+        return True
+    return isinstance(instance, Number) and not isinstance(instance, bool)
+
+
+def _is_integer(instance: Any) -> bool:
+    kind = type(instance)
+    if kind is int:
+        return True
+    if kind is float:
+        return instance.is_integer()
+    return isinstance(instance, int) and not isinstance(instance, bool)
+
+
+_TYPE_TESTS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda instance: isinstance(instance, dict),
+    "array": lambda instance: isinstance(instance, list),
+    "string": lambda instance: isinstance(instance, str),
+    "number": _is_number,
+    "integer": _is_integer,
+    "boolean": lambda instance: isinstance(instance, bool),
+    "null": lambda instance: instance is None,
+}
+
+
+def _compile_type(type_name: str, schema: Dict[str, Any]) -> _Check:
+    test = _TYPE_TESTS[type_name]
+
+    def check_type(instance: Any) -> None:
+        if not test(instance):
+            raise _Invalid(f"{instance!r} is not of type {type_name!r}")
+
+    return check_type
+
+
+def _compile_enum(options: List[Any], schema: Dict[str, Any]) -> _Check:
+    def check_enum(instance: Any) -> None:
+        if instance not in options:
+            raise _Invalid(f"{instance!r} is not one of {options!r}")
+
+    return check_enum
+
+
+def _compile_minimum(minimum: float, schema: Dict[str, Any]) -> _Check:
+    def check_minimum(instance: Any) -> None:
+        if _is_number(instance) and instance < minimum:
+            raise _Invalid(f"{instance!r} is less than the minimum of {minimum!r}")
+
+    return check_minimum
+
+
+def _compile_maximum(maximum: float, schema: Dict[str, Any]) -> _Check:
+    def check_maximum(instance: Any) -> None:
+        if _is_number(instance) and instance > maximum:
+            raise _Invalid(f"{instance!r} is greater than the maximum of {maximum!r}")
+
+    return check_maximum
+
+
+def _compile_required(required: List[str], schema: Dict[str, Any]) -> _Check:
+    def check_required(instance: Any) -> None:
+        if isinstance(instance, dict):
+            for key in required:
+                if key not in instance:
+                    raise _Invalid(f"{key!r} is a required property")
+
+    return check_required
+
+
+def _compile_properties(properties: Dict[str, Any], schema: Dict[str, Any]) -> _Check:
+    compiled = [(key, _compile(sub)) for key, sub in properties.items()]
+
+    def check_properties(instance: Any) -> None:
+        if not isinstance(instance, dict):
+            return
+        for key, check in compiled:
+            if key in instance:
+                try:
+                    check(instance[key])
+                except _Invalid as exc:
+                    exc.path.append(f".{key}")
+                    raise
+
+    return check_properties
+
+
+def _compile_items(items: Dict[str, Any], schema: Dict[str, Any]) -> _Check:
+    check = _compile(items)
+
+    def check_items(instance: Any) -> None:
+        if not isinstance(instance, list):
+            return
+        for index, item in enumerate(instance):
+            try:
+                check(item)
+            except _Invalid as exc:
+                exc.path.append(f"[{index}]")
+                raise
+
+    return check_items
+
+
+def _compile_min_items(count: int, schema: Dict[str, Any]) -> _Check:
+    def check_min_items(instance: Any) -> None:
+        if isinstance(instance, list) and len(instance) < count:
+            raise _Invalid(f"{instance!r} should have at least {count} items")
+
+    return check_min_items
+
+
+def _compile_max_items(count: int, schema: Dict[str, Any]) -> _Check:
+    def check_max_items(instance: Any) -> None:
+        if isinstance(instance, list) and len(instance) > count:
+            raise _Invalid(f"{instance!r} should have at most {count} items")
+
+    return check_max_items
+
+
+# Cheap scalar checks run first so most failures are found before recursing.
+_COMPILERS: Dict[str, Callable[[Any, Dict[str, Any]], _Check]] = {
+    "type": _compile_type,
+    "enum": _compile_enum,
+    "minimum": _compile_minimum,
+    "maximum": _compile_maximum,
+    "required": _compile_required,
+    "minItems": _compile_min_items,
+    "maxItems": _compile_max_items,
+    "properties": _compile_properties,
+    "items": _compile_items,
+}
+
+SCHEMA_VALIDATE = compile_schema(SCHEMA)
+PROJECT_SCHEMA_VALIDATE = compile_schema(PROJECT_SCHEMA)
+FILE_SCHEMA_VALIDATE = compile_schema(FILE_SCHEMA)
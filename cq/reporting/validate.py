@@ -1,32 +1,83 @@
 """Schema validation helpers."""
 from __future__ import annotations
 
-from typing import Any, Dict
+import json
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Tuple
 
 try:  # pragma: no cover - optional dependency
-    from jsonschema import Draft202012Validator, ValidationError
+    from jsonschema import Draft202012Validator
 except ImportError:  # pragma: no cover - fallback
     Draft202012Validator = None  # type: ignore
-    ValidationError = Exception  # type: ignore
 
-from ..models import Report
-from .schema import SCHEMA
+from ..models import FileReport, Report
+from .schema import (
+    FILE_SCHEMA,
+    PROJECT_SCHEMA_VALIDATE,
+    SCHEMA,
+    SCHEMA_VALIDATE,
+    compile_accessors,
+)
 
 
 if Draft202012Validator is not None:
-    _VALIDATOR = Draft202012Validator(SCHEMA)
-else:  # pragma: no cover - fallback
-    _VALIDATOR = None
+    Draft202012Validator.check_schema(SCHEMA)
+
+
+def _lint_count(category: str) -> Callable[[FileReport], int]:
+    return lambda f: f.metrics.lint_counts.get(category, 0)
+
+
+# Where each property of a serialized file entry lives on FileReport; mirrors
+# json_report.serialize_report.
+_FILE_ACCESSORS: Dict[Tuple[str, ...], Callable[[FileReport], Any]] = {
+    ("path",): attrgetter("path"),
+    ("loc",): attrgetter("loc"),
+    ("role",): attrgetter("role"),
+    ("metrics", "duplication_ratio"): attrgetter("metrics.duplication_ratio"),
+    ("metrics", "lint", "C"): _lint_count("C"),
+    ("metrics", "lint", "W"): _lint_count("W"),
+    ("metrics", "lint", "R"): _lint_count("R"),
+    ("metrics", "lint", "E"): _lint_count("E"),
+    ("metrics", "lint", "weighted_score"): attrgetter("metrics.lint_weighted_score"),
+    ("metrics", "typing", "mypy_errors"): attrgetter("metrics.typing_errors"),
+    ("metrics", "typing", "annotation_coverage"): attrgetter("metrics.annotation_coverage"),
+    ("metrics", "typing", "score"): attrgetter("metrics.typing_score"),
+    ("metrics", "complexity", "cognitive"): attrgetter("metrics.cognitive_complexity"),
+    ("metrics", "complexity", "per_loc"): attrgetter("metrics.complexity_per_loc"),
+    ("metrics", "complexity", "score"): attrgetter("metrics.complexity_score"),
+    ("grade",): attrgetter("grade"),
+    ("confidence",): attrgetter("confidence"),
+    ("missing_reasons",): attrgetter("missing_reasons"),
+}
+_FILE_REPORT_VALIDATE = compile_accessors(FILE_SCHEMA, _FILE_ACCESSORS)
 
 
 def validate_dict(data: Dict[str, Any], schema: Dict[str, Any] | None = None) -> None:
+    # The bundled schema is compiled ahead of time; jsonschema only handles custom schemas.
+    if not schema or schema is SCHEMA:
+        SCHEMA_VALIDATE(data)
+        return
     if Draft202012Validator is None:
         return
-    validator = Draft202012Validator(schema or SCHEMA)
-    validator.validate(data)
+    _validator_for(json.dumps(schema, sort_keys=True)).validate(data)
+
+
+@lru_cache(maxsize=32)
+def _validator_for(schema_json: str) -> Any:
+    """Build (and check) a validator once per distinct custom schema."""
+    schema = json.loads(schema_json)
+    Draft202012Validator.check_schema(schema)
+    return Draft202012Validator(schema)
 
 
 def validate_report(report: Report) -> None:
+    """Validate ``report`` against the schema one file at a time.
+
+    The project section is checked on its own, then each ``FileReport`` is checked in place
+    through attribute accessors, so no per-file dicts are built just to be validated.
+    """
     data = {
         "meta": report.meta,
         "project": {
@@ -47,42 +98,7 @@ def validate_report(report: Report) -> None:
             },
             "architecture": {"violations": report.project.architecture_violations},
         },
-        "files": [
-            {
-                "path": f.path,
-                "loc": f.loc,
-                "role": f.role,
-                "metrics": {
-                    "duplication_ratio": f.metrics.duplication_ratio,
-                    "lint": {
-                        "C": f.metrics.lint_counts.get("C", 0),
-                        "W": f.metrics.lint_counts.get("W", 0),
-                        "R": f.metrics.lint_counts.get("R", 0),
-                        "E": f.metrics.lint_counts.get("E", 0),
-                        "weighted_score": f.metrics.lint_weighted_score,
-                    },
-                    "typing": {
-                        "mypy_errors": f.metrics.typing_errors,
-                        "annotation_coverage": f.metrics.annotation_coverage,
-                        "score": f.metrics.typing_score,
-                    },
-                    "complexity": {
-                        "cognitive": f.metrics.cognitive_complexity,
-                        "per_loc": f.metrics.complexity_per_loc,
-                        "score": f.metrics.complexity_score,
-                    },
-                },
-                "grade": f.grade,
-                "confidence": f.confidence,
-                "missing_reasons": f.missing_reasons,
-            }
-            for f in report.files
-        ],
     }
-    if _VALIDATOR is None:
-        return
-    try:
-        _VALIDATOR.validate(data)
-    except ValidationError as exc:  # pragma: no cover - defensive
-        raise ValueError(str(exc))
-
+    PROJECT_SCHEMA_VALIDATE(data)
+    for f in report.files:
+        _FILE_REPORT_VALIDATE(f)
@@ -1,13 +1,16 @@
 """Main runner orchestrating analysis."""
 from __future__ import annotations
 
+import ast
 import math
+import operator
 import platform
-import statistics
+import sys
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from random import Random
-from typing import Dict, Iterable, List, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 from .analyzers.architecture import ArchitectureAnalyzer
 from .analyzers.complexity import ComplexityAnalyzer
@@ -15,10 +18,21 @@ from .analyzers.duplication import DuplicationAnalyzer
 from .analyzers.lint import LintAnalyzer
 from .analyzers.typing import TypingAnalyzer
 from .config import Config
-from .models import FileMetrics, FileReport, ProjectConfidence, ProjectReport, ProjectSummary, Report
+from .models import (
+    FileMetrics,
+    FileReport,
+    FileTable,
+    ProjectConfidence,
+    ProjectReport,
+    ProjectSummary,
+    Report,
+)
 from .reporting.validate import validate_report
-from .utils import fs
+from .utils import file_scan, fs
 from .utils.ast_tools import count_annotation_coverage, safe_parse
+from .utils.cache import MISSING, ResultCache
+from .utils.file_scan import FileScan
+from .utils.parallel import create_executor, map_files
 
 
 class Runner:
@@ -29,47 +43,71 @@ class Runner:
         include = [str(root_path / Path(p)) for p in self.config.paths.include]
         exclude = [str(root_path / Path(p)) for p in self.config.paths.exclude]
         files = sorted(fs.iter_python_files(include, exclude))
-        sources: Dict[str, str] = {}
-        loc_map: Dict[str, int] = {}
-        roles: Dict[str, str] = {}
-        coverage_ratio: Dict[str, float] = {}
-        parser_success: Dict[str, bool] = {}
-        for path in files:
-            text, loc = fs.read_text(path)
-            rel_path = str(path.relative_to(root_path))
-            sources[rel_path] = text
-            loc_map[rel_path] = loc
-            roles[rel_path] = fs.detect_role(path)
-            tree, success = safe_parse(text)
-            parser_success[rel_path] = success
-            if tree is not None and success:
-                annotated, total = count_annotation_coverage(tree)
-                coverage_ratio[rel_path] = annotated / total if total else 0.0
-            else:
-                coverage_ratio[rel_path] = 0.0
-
-        duplication = DuplicationAnalyzer(self.config.duplication).analyze(sources)
-        architecture = ArchitectureAnalyzer(self.config.arch).analyze(sources)
-        complexity = ComplexityAnalyzer(self.config).analyze(sources, loc_map)
-
-        lint = LintAnalyzer(self.config).analyze([str(root_path / f) for f in sources.keys()])
-        typing = TypingAnalyzer(self.config).analyze(
-            [str(root_path / f) for f in sources.keys()], loc_map, coverage_ratio
-        )
+        cache = self._open_cache(root_path)
+        executor = create_executor(self.config.tools.jobs)
+        role_weights = self.config.weights["roles"]
+        # Files in roles weighted to zero cannot move the project grade, so skip their ASTs.
+        unparsed_roles = frozenset(role for role, weight in role_weights.items() if weight == 0)
+        try:
+            sources, table, trees, scans = self._prepass(
+                files, root_path, cache, executor, unparsed_roles
+            )
+            loc_map = table.loc_by_path()
+            coverage_ratio = table.coverage_by_path()
+
+            # Built once and shared by the tool runs and the per-file lookups in the report loop.
+            abs_paths = [str(root_path / rel_path) for rel_path in table.paths]
+
+            # pylint and mypy spend their time in subprocesses, so start them on threads now
+            # and let them overlap with each other and with the in-process analyzers below.
+            tool_threads = ThreadPoolExecutor(max_workers=2)
+            lint_future = tool_threads.submit(LintAnalyzer(self.config).analyze, abs_paths)
+            typing_future = tool_threads.submit(
+                TypingAnalyzer(self.config).analyze, abs_paths, loc_map, coverage_ratio
+            )
+            tool_threads.shutdown(wait=False)
+
+            duplication = DuplicationAnalyzer(self.config.duplication).analyze(
+                sources, executor, cache, scans
+            )
+            parsed_sources = {
+                rel_path: sources[rel_path]
+                for rel_path, role in zip(table.paths, table.roles)
+                if role not in unparsed_roles
+            }
+            architecture = ArchitectureAnalyzer(self.config.arch).analyze(
+                parsed_sources, trees, executor, cache
+            )
+            complexity = ComplexityAnalyzer(self.config).analyze(
+                parsed_sources, loc_map, trees, executor, cache
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        if cache is not None:
+            cache.save()
+
+        lint = lint_future.result()
+        typing = typing_future.result()
 
         files_report: List[FileReport] = []
-        weights = self.config.weights["metrics"]
+        grade_weights = _grade_weights(self.config.weights["metrics"])
         degraded_metrics: set[str] = set()
-        for rel_path, loc in loc_map.items():
+        for row, rel_path in enumerate(table.paths):
+            loc = table.loc[row]
+            parsed = table.parser_success[row]
+            abs_path = abs_paths[row]
             missing: List[str] = []
-            lint_counts = lint.counts.get(str(root_path / rel_path), {"C": 0, "W": 0, "R": 0, "E": 0})
-            lint_score = lint.weighted_scores.get(str(root_path / rel_path), 100.0)
+            if table.roles[row] in unparsed_roles:
+                missing.append("not parsed: role weight is zero")
+            lint_counts = lint.counts.get(abs_path, {"C": 0, "W": 0, "R": 0, "E": 0})
+            lint_score = lint.weighted_scores.get(abs_path, 100.0)
             lint_conf = 0.4 if lint.degraded else 1.0
             if lint.degraded:
                 degraded_metrics.add("lint")
                 missing.append(lint.missing_reason or "pylint degraded")
-            typing_errors = typing.errors.get(str(root_path / rel_path), 0)
-            typing_score = typing.scores.get(str(root_path / rel_path), 100.0)
+            typing_errors = typing.errors.get(abs_path, 0)
+            typing_score = typing.scores.get(abs_path, 100.0)
             typing_conf = 0.4 if typing.degraded else 1.0
             if typing.degraded:
                 degraded_metrics.add("typing")
@@ -79,16 +117,16 @@ class Runner:
             complexity_score = complexity.scores.get(rel_path, 100.0)
             complexity_raw = complexity.raw.get(rel_path, 0)
             complexity_per_loc = complexity.per_loc.get(rel_path, 0.0)
-            complexity_conf = 1.0 if parser_success.get(rel_path, False) else 0.5
+            complexity_conf = 1.0 if parsed else 0.5
             base_conf = min(1.0, math.log1p(loc) / math.log1p(300))
-            base_conf *= 1.0 if parser_success.get(rel_path, False) else 0.6
+            base_conf *= 1.0 if parsed else 0.6
             file_conf = {
                 "duplication": base_conf * duplication_conf,
                 "lint": base_conf * lint_conf,
                 "typing": base_conf * typing_conf,
                 "complexity": base_conf * complexity_conf,
             }
-            overall_conf = min(1.0, statistics.mean(file_conf.values()))
+            overall_conf = min(1.0, math.fsum(file_conf.values()) / len(file_conf))
             file_conf["overall"] = overall_conf
             metrics = FileMetrics(
                 duplication_ratio=duplication_ratio,
@@ -96,20 +134,17 @@ class Runner:
                 lint_weighted_score=lint_score,
                 typing_errors=typing_errors,
                 typing_score=typing_score,
-                annotation_coverage=coverage_ratio.get(rel_path, 0.0),
+                annotation_coverage=table.coverage[row],
                 cognitive_complexity=complexity_raw,
                 complexity_score=complexity_score,
                 complexity_per_loc=complexity_per_loc,
             )
-            grade = _weighted_grade(
-                metrics,
-                weights,
-            )
+            grade = _weighted_grade(metrics, grade_weights)
             files_report.append(
                 FileReport(
                     path=rel_path,
                     loc=loc,
-                    role=roles.get(rel_path, "default"),
+                    role=table.roles[row],
                     metrics=metrics,
                     grade=grade,
                     confidence=file_conf,
@@ -117,7 +152,6 @@ class Runner:
                 )
             )
 
-        role_weights = self.config.weights["roles"]
         project_metrics = _aggregate_project(files_report, role_weights)
         bootstrap_interval = _bootstrap_interval(
             [f.grade for f in files_report],
@@ -125,18 +159,7 @@ class Runner:
             self.config.bootstrap.seed,
         )
         project_confidence = ProjectConfidence(
-            per_metric={
-                "duplication": statistics.mean(f.confidence["duplication"] for f in files_report)
-                if files_report
-                else 0.0,
-                "lint": statistics.mean(f.confidence["lint"] for f in files_report) if files_report else 0.0,
-                "typing": statistics.mean(f.confidence["typing"] for f in files_report)
-                if files_report
-                else 0.0,
-                "complexity": statistics.mean(f.confidence["complexity"] for f in files_report)
-                if files_report
-                else 0.0,
-            },
+            per_metric=_mean_confidence(files_report),
             intervals={"grade": bootstrap_interval},
             degraded=sorted(degraded_metrics),
         )
@@ -184,34 +207,182 @@ class Runner:
             errors.append(str(exc))
         return report, errors
 
+    def _prepass(
+        self,
+        files: List[Path],
+        root_path: Path,
+        cache: Optional[ResultCache],
+        executor: Optional[Executor],
+        unparsed_roles: FrozenSet[str] = frozenset(),
+    ) -> Tuple[Dict[str, str], FileTable, Dict[str, ast.AST], Dict[str, FileScan]]:
+        """Read, tokenize and parse every file, filling the per-file table.
+
+        Files whose role is in ``unparsed_roles`` are only tokenized; they are recorded as
+        not parsed, with no annotation coverage.
+
+        With a process pool, uncached files are scanned and parsed in the workers. Their
+        trees are not sent back (pickling an AST costs more than re-parsing it), so the
+        returned ``trees`` is only populated for in-process runs. Token scans are cheap to
+        pickle and are always returned.
+        """
+        sources: Dict[str, str] = {}
+        roles: List[str] = []
+        rows: List[Optional[Tuple[int, bool, float]]] = []
+        pending: List[Tuple[int, Path, str, bool]] = []
+        for path in files:
+            text = fs.read_text(path)
+            rel_path = sys.intern(str(path.relative_to(root_path)))
+            sources[rel_path] = text
+            role = fs.detect_role(path)
+            roles.append(role)
+            parse = role not in unparsed_roles
+            cached = (
+                cache.get(_prepass_key(parse), rel_path, text) if cache is not None else MISSING
+            )
+            row = _decode_prepass(cached) if cached is not MISSING else None
+            if row is None:
+                pending.append((len(rows), path, rel_path, parse))
+            rows.append(row)
+
+        trees: Dict[str, ast.AST] = {}
+        scans: Dict[str, FileScan] = {}
+        results: Iterable[Tuple[FileScan, bool, float]]
+        if executor is None:
+            results = []
+            for _, _, rel_path, parse in pending:
+                text = sources[rel_path]
+                # safe_parse is memoized (bounded), so rescans of unchanged files reuse trees.
+                tree = safe_parse(text)[0] if parse else None
+                if tree is not None:
+                    trees[rel_path] = tree
+                results.append((file_scan.scan(text), tree is not None, _coverage(tree)))
+        else:
+            results = map_files(
+                executor,
+                _prepass_file,
+                [sources[rel_path] for _, _, rel_path, _ in pending],
+                [parse for _, _, _, parse in pending],
+            )
+        for (index, _, rel_path, parse), (scan, success, coverage) in zip(pending, results):
+            # One tokenize pass gives the line count here and the duplication tokens later.
+            scans[rel_path] = scan
+            rows[index] = (scan.loc, success, coverage)
+            if cache is not None:
+                cache.put(
+                    _prepass_key(parse), rel_path, sources[rel_path], [scan.loc, success, coverage]
+                )
+
+        table = FileTable()
+        for rel_path, role, row in zip(sources, roles, rows):
+            assert row is not None  # every pending row was filled in above
+            loc, success, coverage = row
+            table.append(rel_path, loc, role, success, coverage)
+        return sources, table, trees, scans
+
+    def _open_cache(self, root_path: Path) -> Optional[ResultCache]:
+        if not self.config.cache.enabled:
+            return None
+        return ResultCache.for_config(root_path / self.config.cache.dir, self.config)
+
+
+def _coverage(tree: Optional[ast.AST]) -> float:
+    if tree is None:
+        return 0.0
+    annotated, total = count_annotation_coverage(tree)
+    return annotated / total if total else 0.0
+
+
+def _prepass_file(text: str, parse: bool = True) -> Tuple[FileScan, bool, float]:
+    if not parse:
+        return file_scan.scan(text), False, 0.0
+    tree, success = safe_parse(text)
+    return file_scan.scan(text), success and tree is not None, _coverage(tree)
+
 
-def _weighted_grade(metrics: FileMetrics, weights: Dict[str, float]) -> float:
-    return sum(
-        [
-            (1 - metrics.duplication_ratio) * weights.get("duplication", 0.0) * 100,
-            metrics.lint_weighted_score * weights.get("lint", 0.0),
-            metrics.typing_score * weights.get("typing", 0.0),
-            metrics.complexity_score * weights.get("complexity", 0.0),
-        ]
-    ) / max(1e-6, sum(weights.values()))
+def _prepass_key(parse: bool) -> str:
+    # Role weights are not part of the cache key, so scan-only entries live apart.
+    return "prepass" if parse else "prepass-scan"
+
+
+def _decode_prepass(cached: Any) -> Optional[Tuple[int, bool, float]]:
+    """Unpack a cached ``[loc, success, coverage]`` row; None if it is malformed."""
+    try:
+        loc, success, coverage = cached
+    except (TypeError, ValueError):
+        return None
+    if type(loc) is not int or type(success) is not bool or type(coverage) not in (int, float):
+        return None
+    return loc, success, coverage
+
+
+def _grade_weights(weights: Dict[str, float]) -> Tuple[float, float, float, float, float]:
+    """Resolve the metric weights once per run: four per-metric weights and their total."""
+    return (
+        weights.get("duplication", 0.0),
+        weights.get("lint", 0.0),
+        weights.get("typing", 0.0),
+        weights.get("complexity", 0.0),
+        max(1e-6, sum(weights.values())),
+    )
+
+
+def _weighted_grade(
+    metrics: FileMetrics, grade_weights: Tuple[float, float, float, float, float]
+) -> float:
+    w_duplication, w_lint, w_typing, w_complexity, total = grade_weights
+    return (
+        (1 - metrics.duplication_ratio) * w_duplication * 100
+        + metrics.lint_weighted_score * w_lint
+        + metrics.typing_score * w_typing
+        + metrics.complexity_score * w_complexity
+    ) / total
 
 
 def _aggregate_project(files: List[FileReport], role_weights: Dict[str, float]) -> Dict[str, float]:
-    totals = {"duplication": 0.0, "lint": 0.0, "typing": 0.0, "complexity": 0.0, "grade": 0.0}
-    weight_totals = {key: 0.0 for key in totals.keys()}
-    for file_report in files:
-        role_weight = role_weights.get(file_report.role, role_weights.get("default", 1.0))
-        factor = role_weight * file_report.loc
-        totals["duplication"] += (1 - file_report.metrics.duplication_ratio) * factor * 100
-        totals["lint"] += file_report.metrics.lint_weighted_score * factor
-        totals["typing"] += file_report.metrics.typing_score * factor
-        totals["complexity"] += file_report.metrics.complexity_score * factor
-        totals["grade"] += file_report.grade * factor
-        for key in weight_totals.keys():
-            weight_totals[key] += factor
+    # Column-wise: one LOC x role weight factor per file, then one weighted sum per metric.
+    default_weight = role_weights.get("default", 1.0)
+    factors = [
+        role_weights.get(file_report.role, default_weight) * file_report.loc
+        for file_report in files
+    ]
+    metrics = [file_report.metrics for file_report in files]
+    totals = {
+        "duplication": sum(
+            (1 - m.duplication_ratio) * factor * 100 for m, factor in zip(metrics, factors)
+        ),
+        "lint": _dot([m.lint_weighted_score for m in metrics], factors),
+        "typing": _dot([m.typing_score for m in metrics], factors),
+        "complexity": _dot([m.complexity_score for m in metrics], factors),
+        "grade": _dot([file_report.grade for file_report in files], factors),
+    }
+    weight_total = sum(factors)
+    if not weight_total:
+        return {key: 0.0 for key in totals}
+    return {key: total / max(1e-6, weight_total) for key, total in totals.items()}
+
+
+def _dot(values: List[float], factors: List[float]) -> float:
+    return sum(map(operator.mul, values, factors))
+
+
+def _mean_confidence(files_report: List[FileReport]) -> Dict[str, float]:
+    """Average the per-metric file confidences, gathering all four columns in one pass."""
+    duplication: List[float] = []
+    lint: List[float] = []
+    typing: List[float] = []
+    complexity: List[float] = []
+    for f in files_report:
+        conf = f.confidence
+        duplication.append(conf["duplication"])
+        lint.append(conf["lint"])
+        typing.append(conf["typing"])
+        complexity.append(conf["complexity"])
+    count = len(files_report) or 1
     return {
-        key: (totals[key] / max(1e-6, weight_totals[key])) if weight_totals[key] else 0.0
-        for key in totals.keys()
+        "duplication": math.fsum(duplication) / count,
+        "lint": math.fsum(lint) / count,
+        "typing": math.fsum(typing) / count,
+        "complexity": math.fsum(complexity) / count,
     }
 
 
@@ -219,11 +390,10 @@ def _bootstrap_interval(values: List[float], iterations: int, seed: int) -> List
     if not values:
         return [0.0, 0.0]
     rng = Random(seed)
-    samples = []
-    for _ in range(iterations):
-        sample = [rng.choice(values) for _ in values]
-        samples.append(statistics.mean(sample))
-    samples.sort()
+    choices = rng.choices
+    size = len(values)
+    # One C-level draw of the whole resample per iteration, and a plain float mean.
+    samples = sorted(sum(choices(values, k=size)) / size for _ in range(iterations))
     n = len(samples)
     lower_idx = max(0, int(0.05 * (n - 1)))
     upper_idx = min(n - 1, int(0.95 * (n - 1)))
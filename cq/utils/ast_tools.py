@@ -2,52 +2,21 @@
 from __future__ import annotations
 
 import ast
+from functools import lru_cache, partial
+from itertools import chain
 from typing import Iterable, List, Tuple
 
-
-class NormalizingTransformer(ast.NodeTransformer):
-    """Normalize identifiers and literals for duplication detection."""
-
-    def __init__(self, identifier_placeholder: str = "ID") -> None:
-        self.identifier_placeholder = identifier_placeholder
-
-    def visit_Name(self, node: ast.Name) -> ast.AST:  # noqa: N802
-        return ast.copy_location(ast.Name(id=self.identifier_placeholder, ctx=node.ctx), node)
-
-    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:  # noqa: N802
-        new_node = ast.Attribute(
-            value=self.visit(node.value),
-            attr=self.identifier_placeholder,
-            ctx=node.ctx,
-        )
-        return ast.copy_location(new_node, node)
-
-    def visit_Constant(self, node: ast.Constant) -> ast.AST:  # noqa: N802
-        return ast.copy_location(ast.Constant(value="CONST"), node)
-
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.AST:  # noqa: N802
-        node.name = self.identifier_placeholder
-        self.generic_visit(node)
-        return node
-
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> ast.AST:  # noqa: N802
-        node.name = self.identifier_placeholder
-        self.generic_visit(node)
-        return node
-
-    def visit_ClassDef(self, node: ast.ClassDef) -> ast.AST:  # noqa: N802
-        node.name = self.identifier_placeholder
-        self.generic_visit(node)
-        return node
-
-    def visit_arg(self, node: ast.arg) -> ast.AST:  # noqa: N802
-        node.arg = self.identifier_placeholder
-        return node
+_parse = partial(ast.parse, type_comments=False)
 
 
+@lru_cache(maxsize=256)
 def safe_parse(source: str) -> Tuple[ast.AST | None, bool]:
+    """Parse ``source``, memoized so analyzers sharing a process parse each file once.
+
+    Returned trees are shared between callers and must not be mutated.
+    """
     try:
-        return ast.parse(source), True
+        return _parse(source), True
     except SyntaxError:
         return None, False
 
@@ -62,15 +31,23 @@ def iter_imports(tree: ast.AST) -> Iterable[Tuple[str, str]]:
             yield module, module.split(".")[0] if module else ""
 
 
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+# Functions are statements, so only statement-holding fields can lead to one; expressions
+# (the bulk of any tree) are never visited.
+_BLOCK_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+
 def count_annotation_coverage(tree: ast.AST) -> Tuple[int, int]:
     annotated = 0
     total = 0
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+    stack: List[ast.AST] = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _FUNCTION_NODES):
             if node.returns is not None:
                 annotated += 1
             total += 1
-            for arg in list(node.args.args) + list(node.args.kwonlyargs):
+            for arg in chain(node.args.args, node.args.kwonlyargs):
                 if arg.annotation is not None:
                     annotated += 1
                 total += 1
@@ -82,5 +59,8 @@ def count_annotation_coverage(tree: ast.AST) -> Tuple[int, int]:
                 total += 1
                 if node.args.kwarg.annotation is not None:
                     annotated += 1
+        for field in _BLOCK_FIELDS:
+            block = getattr(node, field, None)
+            if isinstance(block, list):
+                stack.extend(block)
     return annotated, total
-
@@ -0,0 +1,142 @@
+"""Content-addressed cache of per-file analyzer results."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import Executor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from .. import __version__
+from ..config import Config
+from .parallel import map_files
+
+CACHE_FILE = "results.json"
+# Bump whenever the shape of a cached entry changes.
+CACHE_FORMAT = 3
+# Returned by ``ResultCache.get`` on a miss; ``None`` is a valid cached result.
+MISSING = object()
+
+
+class ResultCache:
+    """Per-file results keyed by analyzer, path and a hash of the file contents.
+
+    Entries are stored as JSON (never pickle, since the cache lives inside the scanned tree)
+    and the whole store is dropped when the cq version or any configuration that feeds a
+    cached result changes. Only entries read or written during a run are saved back, so
+    results for deleted or edited files do not accumulate.
+    """
+
+    def __init__(self, directory: Path, config_key: str) -> None:
+        self.directory = directory
+        self.config_key = config_key
+        self._entries: Dict[str, Any] = {}
+        self._live: Dict[str, Any] = {}
+        self._load()
+
+    @classmethod
+    def for_config(cls, directory: Path, config: Config) -> "ResultCache":
+        return cls(directory, config_key(config))
+
+    def get(self, analyzer: str, path: str, source: str) -> Any:
+        key = _entry_key(analyzer, path, source)
+        value = self._entries.get(key, MISSING)
+        if value is not MISSING:
+            self._live[key] = value
+        return value
+
+    def put(self, analyzer: str, path: str, source: str, value: Any) -> None:
+        key = _entry_key(analyzer, path, source)
+        self._entries[key] = value
+        self._live[key] = value
+
+    def save(self) -> None:
+        payload = {"config": self.config_key, "entries": self._live}
+        tmp_name = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, separators=(",", ":"))
+            os.replace(tmp_name, self.directory / CACHE_FILE)
+        except OSError:  # pragma: no cover - a read-only tree just runs uncached next time
+            # Do not leave the partial file behind in the scanned tree.
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def _load(self) -> None:
+        try:
+            with (self.directory / CACHE_FILE).open(encoding="utf-8") as fh:
+                payload = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("config") == self.config_key:
+            entries = payload.get("entries")
+            if isinstance(entries, dict):
+                self._entries = entries
+
+
+def config_key(config: Config) -> str:
+    """Hash the cq version and the settings that per-file results depend on."""
+    relevant = {
+        "version": __version__,
+        "format": CACHE_FORMAT,
+        "arch": asdict(config.arch),
+        "duplication": asdict(config.duplication),
+    }
+    encoded = json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def map_cached(
+    cache: Optional[ResultCache],
+    analyzer: str,
+    files: Mapping[str, str],
+    executor: Optional[Executor],
+    fn: Callable[..., Any],
+    *iterables: Iterable[Any],
+    encode: Optional[Callable[[Any], Any]] = None,
+    decode: Optional[Callable[[Any], Any]] = None,
+) -> List[Any]:
+    """Like ``map_files`` over ``files`` (path -> source), but only computing cache misses.
+
+    ``iterables`` are the per-file arguments for ``fn`` in the order of ``files``. Cached
+    values go through ``encode``/``decode`` when results are not plain JSON; an entry that
+    ``decode`` rejects with ``TypeError`` or ``ValueError`` is recomputed like a miss.
+    """
+    if cache is None:
+        return list(map_files(executor, fn, *iterables))
+    items = list(files.items())
+    results: List[Any] = []
+    missing: List[int] = []
+    for index, (path, source) in enumerate(items):
+        value = cache.get(analyzer, path, source)
+        if value is not MISSING and decode is not None:
+            try:
+                value = decode(value)
+            except (TypeError, ValueError, OverflowError):
+                value = MISSING
+        if value is MISSING:
+            missing.append(index)
+        results.append(value)
+    if missing:
+        columns = [list(it) for it in iterables]
+        subset = [[column[i] for i in missing] for column in columns]
+        for index, value in zip(missing, map_files(executor, fn, *subset)):
+            results[index] = value
+            path, source = items[index]
+            cache.put(analyzer, path, source, encode(value) if encode is not None else value)
+    return results
+
+
+def _entry_key(analyzer: str, path: str, source: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{analyzer}\0{path}\0".encode("utf-8"))
+    digest.update(source.encode("utf-8", errors="surrogatepass"))
+    return digest.hexdigest()
@@ -0,0 +1,49 @@
+"""Single tokenize pass over a source file, shared by LOC counting and duplication."""
+from __future__ import annotations
+
+import io
+import tokenize
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# Layout tokens carry no content for any consumer, so they are dropped during the scan.
+_LAYOUT_TOKENS = frozenset(
+    {
+        tokenize.ENCODING,
+        tokenize.NEWLINE,
+        tokenize.NL,
+        tokenize.INDENT,
+        tokenize.DEDENT,
+        tokenize.ENDMARKER,
+    }
+)
+
+
+@dataclass
+class FileScan:
+    tokens: List[Tuple[int, str]]
+    loc: int
+    success: bool
+
+
+def scan(source: str) -> FileScan:
+    """Tokenize ``source`` once, returning its ``(type, string)`` tokens and line count.
+
+    Sources that cannot be tokenized get no tokens and ``success=False``; their line count
+    is still reported.
+    """
+    loc = count_lines(source)
+    tokens: List[Tuple[int, str]] = []
+    append = tokens.append
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type not in _LAYOUT_TOKENS:
+                append((token.type, token.string))
+    except (tokenize.TokenError, SyntaxError):
+        return FileScan(tokens=[], loc=loc, success=False)
+    return FileScan(tokens=tokens, loc=loc, success=True)
+
+
+def count_lines(source: str) -> int:
+    """Count newline-terminated lines plus a final unterminated one, without splitting."""
+    return source.count("\n") + (1 if source and not source.endswith("\n") else 0)
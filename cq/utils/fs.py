@@ -3,8 +3,9 @@ from __future__ import annotations
 
 import fnmatch
 import os
+import re
 from pathlib import Path
-from typing import Iterable, Iterator, List, Tuple
+from typing import Iterable, Iterator, Optional, Pattern, Set
 
 ROLE_HINTS = {
     "test": ["tests", "test_"],
@@ -15,41 +16,63 @@ ROLE_HINTS = {
 
 
 def iter_python_files(include: Iterable[str], exclude: Iterable[str]) -> Iterator[Path]:
-    includes = [Path(p).resolve() for p in include]
-    excludes = [Path(p).resolve() for p in exclude]
-    seen = set()
-    for base in includes:
-        base_path = base if base.is_absolute() else Path.cwd() / base
+    excludes = _compile_excludes(Path(p).resolve() for p in exclude)
+    seen: Set[str] = set()
+    for base in include:
+        # Only the base is resolved; files below it are yielded under that base.
+        base_path = Path(base).resolve()
         if not base_path.exists():
             continue
-        for path in base_path.rglob("*.py"):
-            abs_path = path.resolve()
-            if _is_excluded(abs_path, excludes):
+        for path in _walk(str(base_path), excludes):
+            if path in seen:
                 continue
-            if abs_path in seen:
-                continue
-            seen.add(abs_path)
-            yield abs_path
+            seen.add(path)
+            yield Path(path)
+
+
+def _walk(root: str, excludes: Optional[Pattern[str]]) -> Iterator[str]:
+    """Yield ``.py`` files under ``root`` with ``os.scandir``, without following directory symlinks.
+
+    A directory matching an exclude prefix is pruned whole, since every path below it
+    shares that prefix.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if excludes is None or excludes.match(entry.path) is None:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py") and entry.is_file():
+                        if excludes is None or excludes.match(entry.path) is None:
+                            yield entry.path
+        except OSError:
+            continue
+
+
+def _compile_excludes(excludes: Iterable[Path]) -> Optional[Pattern[str]]:
+    """Fuse exclude prefixes into one anchored alternation, or ``None`` when there are none."""
+    prefixes = [re.escape(str(pat)) for pat in excludes]
+    if not prefixes:
+        return None
+    return re.compile("(?:" + "|".join(prefixes) + ")")
 
 
-def _is_excluded(path: Path, excludes: List[Path]) -> bool:
-    for pat in excludes:
-        if str(path).startswith(str(pat)):
-            return True
-    return False
+# (hint, role) pairs flattened in ROLE_HINTS order, so the first role with a hint anywhere
+# in the path still wins.
+_ROLE_HINT_PAIRS = tuple((hint, role) for role, hints in ROLE_HINTS.items() for hint in hints)
 
 
 def detect_role(path: Path) -> str:
     lower = str(path).lower()
-    for role, hints in ROLE_HINTS.items():
-        for hint in hints:
-            if hint in lower:
-                return role
+    for hint, role in _ROLE_HINT_PAIRS:
+        if hint in lower:
+            return role
     return "default"
 
 
-def read_text(path: Path) -> Tuple[str, int]:
-    text = path.read_text(encoding="utf-8")
-    loc = sum(1 for _ in text.splitlines())
-    return text, loc
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
 
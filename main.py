@@ -1,37 +1,119 @@
 import ast
-import io
+import hashlib
 import json
+import math
 import os
+import re
 import shutil
 import statistics
 import stat
 import subprocess
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from itertools import chain, repeat
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 from fastapi import FastAPI, Form, HTTPException, Request
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
 from git import Repo
-from git.exc import GitCommandError
-from pylint.lint import Run as PylintRun
+from git.exc import GitCommandError, InvalidGitRepositoryError
 
-try:  # Pylint <= 2.17
-    from pylint.reporters.collecting import CollectingReporter
-except ModuleNotFoundError:  # Pylint >= 3.0
-    from pylint.reporters.collecting_reporter import CollectingReporter
-from radon.complexity import cc_visit
-from radon.metrics import mi_visit
-import tokenize
+try:  # optional: faster serialization of the results API
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+from radon.metrics import h_visit_ast, mi_compute
+from radon.raw import analyze as raw_analyze
+from radon.visitors import ComplexityVisitor
 
 
 APP_TITLE = "RepoGrader Pro (Lite)"
-CLONE_TARGET = Path("/tmp/repo")
+APP_DIR = Path(__file__).resolve().parent
+CLONE_ROOT = Path("/tmp/repograder-clones")
+# Clones are kept so regrading a repository only fetches what changed. Only the most recently
+# graded MAX_CLONES are retained; older ones are deleted after each clone or update.
+MAX_CLONES = 8
+# Requests for the same repository share its checkout, so each checkout is locked from clone
+# or update until grading finishes; eviction skips locked checkouts.
+_CLONE_LOCKS: Dict[Path, threading.Lock] = {}
+_CLONE_LOCKS_GUARD = threading.Lock()
+# Only the files at HEAD are graded, so history, other branches, and tags are never fetched.
+CLONE_OPTIONS = ["--depth=1", "--single-branch", "--no-tags"]
 SKIP_DIRS = {"venv", "__pycache__", "tests", "node_modules", ".git"}
+# Score bands for map_metric: (ascending limits, scores, whether a limit is inclusive).
+COMPLEXITY_BANDS = ((10.0, 20.0), (100, 70, 40), False)
+MAINTAINABILITY_BANDS = ((50.0, 70.0, 85.0), (40, 60, 80, 100), True)
+LINT_BANDS = ((0.0, 5.0, 10.0), (100, 80, 60, 40), True)
+COMMENT_BANDS = ((0.02, 0.05, 0.1), (40, 60, 80, 100), False)
+TYPE_HINT_BANDS = ((0.2, 0.5, 0.8), (40, 60, 80, 100), False)
+# Under 30 lines scores 100 and up to 60 inclusive scores 80, hence the edge just above 60.
+FUNCTION_LENGTH_BANDS = ((30.0, math.nextafter(60.0, math.inf)), (100, 80, 50), False)
+# Comments, and the string literals that can hide a "#", as the tokenizer delimits them.
+# String bodies use the unrolled [^q\\]*(?:escape[^q\\]*)* form so an unterminated string
+# cannot backtrack exponentially. Each terminated form is followed by one that swallows an
+# unterminated literal, so a failed attempt is never rescanned from the next quote; that
+# would make junk full of stray quotes quadratic.
+_STRING_OR_COMMENT_RE = re.compile(
+    r"(?P<comment>#[^\r\n]*)"
+    r"|'''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''"
+    r"|'''.*"
+    r'|"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""'
+    r'|""".*'
+    r"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'"
+    r"|'[^\n]*"
+    r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+    r'|"[^\n]*',
+    re.DOTALL,
+)
+# Line boundaries str.splitlines() honours besides "\n"; sources containing one are rare.
+_OTHER_LINE_BREAKS_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+_BLOCK_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+METRICS_CACHE_DIR = Path("/tmp/repograder-cache")
+# Bump when compute_source_metrics changes so stale cache entries are ignored.
+METRICS_CACHE_VERSION = 4
+# Every key compute_source_metrics returns and the types it holds; anything else read back
+# from the cache is treated as a miss.
+METRIC_FIELD_TYPES = {
+    "cyclomatic_complexity": (int, float),
+    "maintainability_index": (int, float),
+    "comment_density": (int, float),
+    "type_hint_coverage": (int, float),
+    "function_count": (int,),
+    "avg_function_length": (int, float),
+    "loc": (int,),
+    "total_functions": (int,),
+}
+AUDIT_CACHE_DIR = Path("/tmp/repograder-audit")
+# New advisories are published all the time, so cached audits expire.
+AUDIT_CACHE_TTL = 24 * 60 * 60
+# pip treats "#" as a comment at the start of a line or after whitespace.
+_REQUIREMENT_COMMENT_RE = re.compile(r"(?:^|\s)#.*")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    warm_up(app)
+    try:
+        yield
+    finally:
+        shut_down_pool(app)
+
 
-app = FastAPI(title=APP_TITLE)
-templates = Jinja2Templates(directory="templates")
+app = FastAPI(title=APP_TITLE, lifespan=lifespan)
+templates = Jinja2Templates(directory=APP_DIR / "templates")
 
 
 def _handle_remove_readonly(func, path, exc_info):
@@ -53,15 +135,91 @@ def clean_clone_dir(target: Path) -> None:
     target.parent.mkdir(parents=True, exist_ok=True)
 
 
+def clone_target(repo_url: str) -> Path:
+    # One directory per repository, so different repositories never share a checkout.
+    digest = hashlib.blake2b(repo_url.encode("utf-8"), digest_size=6).hexdigest()
+    return CLONE_ROOT / digest
+
+
+def update_clone(repo_url: str, target: Path) -> bool:
+    """Bring an existing clone of ``repo_url`` up to date; return False if it cannot be reused."""
+    repo = Repo(target)
+    if repo.remotes.origin.url != repo_url:
+        return False
+    with repo.git.custom_environment(GIT_TERMINAL_PROMPT="0"):
+        repo.remotes.origin.fetch(depth=1)
+    repo.git.reset("--hard", "FETCH_HEAD")
+    repo.git.clean("-fdx")
+    return True
+
+
 def clone_repository(repo_url: str, target: Path) -> Path:
+    if (target / ".git").is_dir():
+        try:
+            if update_clone(repo_url, target):
+                retain_clone(target)
+                return target
+        except (GitCommandError, InvalidGitRepositoryError, AttributeError):
+            pass  # Fall back to a fresh clone.
     clean_clone_dir(target)
     try:
-        Repo.clone_from(repo_url, target)
+        Repo.clone_from(
+            repo_url,
+            target,
+            multi_options=CLONE_OPTIONS,
+            env={"GIT_TERMINAL_PROMPT": "0"},
+        )
     except GitCommandError as exc:
         raise HTTPException(status_code=400, detail=f"Failed to clone repository: {exc}") from exc
+    retain_clone(target)
     return target
 
 
+@contextmanager
+def locked_clone(target: Path) -> Iterator[None]:
+    """Hold the lock for checkout ``target`` for the duration of the block."""
+    while True:
+        with _CLONE_LOCKS_GUARD:
+            lock = _CLONE_LOCKS.setdefault(target, threading.Lock())
+        lock.acquire()
+        with _CLONE_LOCKS_GUARD:
+            # Eviction drops the lock of a deleted checkout; start over with the current one.
+            if _CLONE_LOCKS.get(target) is lock:
+                break
+        lock.release()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def retain_clone(target: Path) -> None:
+    """Mark ``target`` as just used and delete the least recently used clones beyond MAX_CLONES."""
+    os.utime(target)
+    clones = []
+    try:
+        with os.scandir(CLONE_ROOT) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    clones.append((entry.stat(follow_symlinks=False).st_mtime, Path(entry.path)))
+    except OSError:
+        return
+    clones.sort(reverse=True)
+    for _, path in clones[MAX_CLONES:]:
+        with _CLONE_LOCKS_GUARD:
+            lock = _CLONE_LOCKS.setdefault(path, threading.Lock())
+            if not lock.acquire(blocking=False):
+                continue  # Being graded right now (this includes ``target``).
+        try:
+            shutil.rmtree(path, onerror=_handle_remove_readonly)
+        except OSError:
+            pass  # Best-effort: tried again after the next clone.
+        finally:
+            with _CLONE_LOCKS_GUARD:
+                del _CLONE_LOCKS[path]
+            lock.release()
+
+
 def read_code(path: Path) -> str:
     try:
         return path.read_text(encoding="utf-8")
@@ -70,222 +228,395 @@ def read_code(path: Path) -> str:
         return path.read_text(encoding="latin-1", errors="ignore")
 
 
+def iter_py_files(root: Path) -> Iterator[str]:
+    """Yield the paths of Python files under ``root``, never entering a SKIP_DIRS directory."""
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    yield entry.path
+
+
+def count_lines(source: str) -> int:
+    """Count lines as len(source.splitlines()) would, without building the list."""
+    if _OTHER_LINE_BREAKS_RE.search(source):
+        return len(source.splitlines())
+    return source.count("\n") + (1 if source and not source.endswith("\n") else 0)
+
+
 def compute_comment_density(source: str) -> Tuple[int, float]:
-    total_lines = len(source.splitlines())
+    total_lines = count_lines(source)
     comment_lines = 0
     if not source.strip():
         return 0, 0.0
 
-    try:
-        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
-    except tokenize.TokenError:
-        tokens = []
-
-    seen_comment_lines = set()
-    for token in tokens:
-        if token.type == tokenize.COMMENT:
-            seen_comment_lines.add(token.start[0])
-    comment_lines = len(seen_comment_lines)
+    # A "#" starts a comment unless it sits inside a string literal, so scanning for strings
+    # and comments alone finds the same comments as tokenizing. A comment runs to the end of
+    # its line, so each match is a distinct comment line.
+    if "#" in source:
+        comment_lines = sum(
+            1 for match in _STRING_OR_COMMENT_RE.finditer(source) if match.lastgroup == "comment"
+        )
 
     density = comment_lines / total_lines if total_lines else 0.0
     return total_lines, density
 
 
-def compute_type_hint_coverage(tree: ast.AST) -> Tuple[int, float]:
-    total_functions = 0
-    annotated_functions = 0
+def _iter_functions(tree: ast.AST) -> Iterator[ast.FunctionDef | ast.AsyncFunctionDef]:
+    # Functions are statements, so only statement-holding fields can lead to one; expressions
+    # (the bulk of any tree) are never visited.
+    stack: List[ast.AST] = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _FUNCTION_NODES):
+            yield node
+        for field in _BLOCK_FIELDS:
+            block = getattr(node, field, None)
+            if isinstance(block, list):
+                stack.extend(block)
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            total_functions += 1
-            all_args_annotated = True
 
-            args = list(node.args.posonlyargs) + list(node.args.args) + list(node.args.kwonlyargs)
-            if node.args.vararg:
-                args.append(node.args.vararg)
-            if node.args.kwarg:
-                args.append(node.args.kwarg)
+def compute_function_metrics(tree: ast.AST) -> Tuple[int, float, int, float]:
+    """Return (function_count, avg_function_length, total_functions, type_hint_coverage).
 
-            for arg in args:
-                if getattr(arg, "annotation", None) is None:
-                    all_args_annotated = False
-                    break
+    Length and annotation coverage are gathered in the same walk over the tree.
+    """
+    total_functions = 0
+    total_length = 0
+    annotated_functions = 0
 
-            return_annotated = node.returns is not None
-            if all_args_annotated and return_annotated:
-                annotated_functions += 1
+    for node in _iter_functions(tree):
+        total_functions += 1
+        end_lineno = getattr(node, "end_lineno", None)
+        if end_lineno is not None:
+            total_length += end_lineno - node.lineno + 1
+        else:
+            total_length += len(node.body)
 
+        # The return annotation is the cheaper check, so unannotated functions skip the args.
+        if node.returns is None:
+            continue
+        args = node.args
+        if all(
+            arg.annotation is not None
+            for arg in chain(
+                args.posonlyargs,
+                args.args,
+                args.kwonlyargs,
+                filter(None, (args.vararg, args.kwarg)),
+            )
+        ):
+            annotated_functions += 1
+
+    avg_length = total_length / total_functions if total_functions else 0.0
     coverage = annotated_functions / total_functions if total_functions else 0.0
-    return total_functions, coverage
+    return total_functions, avg_length, total_functions, coverage
 
 
-def compute_avg_function_length(tree: ast.AST) -> Tuple[int, float]:
-    lengths: List[int] = []
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            end_lineno = getattr(node, "end_lineno", None)
-            if end_lineno is not None:
-                lengths.append(end_lineno - node.lineno + 1)
-            else:
-                lengths.append(len(node.body))
-    count = len(lengths)
-    avg_length = statistics.mean(lengths) if lengths else 0.0
-    return count, avg_length
+def run_pylint(paths: List[str]) -> Dict[str, int]:
+    """Lint all ``paths`` in one Pylint subprocess and count the messages per absolute path.
 
-
-def run_pylint(file_path: Path) -> int:
-    reporter = CollectingReporter()
+    Checks that only apply across modules are disabled so each count matches linting the
+    file on its own.
+    """
+    if not paths:
+        return Counter()
     try:
-        PylintRun(
-            [str(file_path), "--score=n", "--exit-zero"],
-            reporter=reporter,
-            do_exit=False,
+        completed = subprocess.run(
+            [
+                sys.executable,
+                # Keep the working directory off sys.path so nothing there can shadow Pylint.
+                "-P",
+                "-m",
+                "pylint",
+                # The cloned repository is untrusted: never load its config files, whose
+                # init-hook Pylint would execute.
+                f"--rcfile={os.devnull}",
+                "--output-format=json2",
+                "--score=n",
+                "--exit-zero",
+                "--disable=duplicate-code,cyclic-import",
+                "-j",
+                str(os.cpu_count() or 1),
+                *(os.path.abspath(path) for path in paths),
+            ],
+            cwd=APP_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            check=False,
         )
-    except Exception:
-        return len(reporter.messages)
-    return len(reporter.messages)
-
-
-def analyze_file(path: Path) -> Dict[str, Any]:
+        if completed.returncode != 0 or not completed.stdout:
+            raise ValueError(f"pylint exited with status {completed.returncode}")
+        messages = json.loads(completed.stdout)["messages"]
+        return Counter(message["absolutePath"] for message in messages)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        # Scoring every file as warning-free would hand out the best lint grade.
+        raise HTTPException(status_code=500, detail="Unable to lint the repository.") from exc
+
+
+# Per-file results stay slotted objects through the worker pipeline and become dicts only
+# when the repository results are assembled.
+@dataclass(slots=True)
+class FileMetrics:
+    cyclomatic_complexity: float
+    maintainability_index: float
+    lint_warnings: int
+    lint_warnings_per_100_loc: float
+    comment_density: float
+    type_hint_coverage: float
+    function_count: int
+    avg_function_length: float
+    total_functions: int
+    loc: int
+
+
+@dataclass(slots=True)
+class FileScore:
+    numeric_score: int
+    letter_grade: str
+    reasons: str
+    components: Dict[str, int]
+
+
+def analyze_file(path: Path, lint_warnings: int) -> FileMetrics:
     source = read_code(path)
-    metrics: Dict[str, Any] = {}
 
     if not source.strip():
-        metrics.update(
-            {
-                "cyclomatic_complexity": 0.0,
-                "maintainability_index": 100.0,
-                "lint_warnings": 0,
-                "lint_warnings_per_100_loc": 0.0,
-                "comment_density": 0.0,
-                "type_hint_coverage": 0.0,
-                "function_count": 0,
-                "avg_function_length": 0.0,
-                "total_functions": 0,
-                "loc": 0,
-            }
+        return FileMetrics(
+            cyclomatic_complexity=0.0,
+            maintainability_index=100.0,
+            lint_warnings=0,
+            lint_warnings_per_100_loc=0.0,
+            comment_density=0.0,
+            type_hint_coverage=0.0,
+            function_count=0,
+            avg_function_length=0.0,
+            total_functions=0,
+            loc=0,
         )
-        return metrics
 
-    # Cyclomatic complexity via radon (average per block)
-    try:
-        cc_results = cc_visit(source)
-        complexities = [block.complexity for block in cc_results]
-        avg_complexity = statistics.mean(complexities) if complexities else 0.0
-    except Exception:
-        avg_complexity = 0.0
+    measured = measure_source(source)
+
+    # Lint warnings (counted for the whole repository up front)
+    normalized_loc = max(measured["loc"], 1)
+    lint_per_100 = (lint_warnings / normalized_loc) * 100
+
+    return FileMetrics(
+        cyclomatic_complexity=measured["cyclomatic_complexity"],
+        maintainability_index=measured["maintainability_index"],
+        lint_warnings=lint_warnings,
+        lint_warnings_per_100_loc=lint_per_100,
+        comment_density=measured["comment_density"],
+        type_hint_coverage=measured["type_hint_coverage"],
+        function_count=measured["function_count"],
+        avg_function_length=measured["avg_function_length"],
+        loc=measured["loc"],
+        total_functions=measured["total_functions"],
+    )
 
-    # Maintainability index
+
+def measure_source(source: str) -> Dict[str, Any]:
+    """Return the metrics that depend only on ``source``, reusing results by content hash.
+
+    Lint counts are left out: they also depend on the Pylint setup and the rest of the repo.
+    The returned dict is shared between callers and must not be modified.
+    """
+    return _measure_cached(_source_key(source), source)
+
+
+@lru_cache(maxsize=4096)
+def _measure_cached(key: str, source: str) -> Dict[str, Any]:
+    # The in-process layer catches files duplicated within one repository.
+    metrics = load_cached_metrics(key)
+    if metrics is None:
+        metrics = compute_source_metrics(source)
+        store_cached_metrics(key, metrics)
+    return metrics
+
+
+def compute_source_metrics(source: str) -> Dict[str, Any]:
+    # One parse feeds radon's visitors and the function metrics.
     try:
-        maintainability = mi_visit(source, True)
-    except Exception:
-        maintainability = 50.0
+        tree: Optional[ast.AST] = ast.parse(source)
+    except (SyntaxError, ValueError):
+        tree = None
+
+    avg_complexity = 0.0
+    maintainability = 50.0
+    if tree is not None:
+        # Cyclomatic complexity via radon (average per block)
+        try:
+            complexity_visitor = ComplexityVisitor.from_ast(tree)
+            blocks = complexity_visitor.blocks
+            if blocks:
+                avg_complexity = sum(block.complexity for block in blocks) / len(blocks)
+        except Exception:
+            complexity_visitor = None
+
+        # Maintainability index, from the same parameters radon's mi_visit gathers
+        if complexity_visitor is not None:
+            try:
+                raw = raw_analyze(source)
+                comment_lines = raw.comments + raw.multi
+                comments = comment_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+                maintainability = mi_compute(
+                    h_visit_ast(tree).total.volume,
+                    complexity_visitor.total_complexity,
+                    raw.lloc,
+                    comments,
+                )
+            except Exception:
+                maintainability = 50.0
 
     # Comment density
     loc, comment_density = compute_comment_density(source)
 
-    # AST-based metrics
-    try:
-        tree = ast.parse(source)
-    except SyntaxError:
-        tree = ast.parse("pass")
+    # AST-based metrics; they only count functions, so sources without "def" skip the walk.
+    if tree is not None and "def" in source:
+        function_count, avg_function_length, total_functions, type_hint_coverage = (
+            compute_function_metrics(tree)
+        )
+    else:
+        function_count, avg_function_length, total_functions, type_hint_coverage = 0, 0.0, 0, 0.0
 
-    function_count, avg_function_length = compute_avg_function_length(tree)
-    total_functions, type_hint_coverage = compute_type_hint_coverage(tree)
+    return {
+        "cyclomatic_complexity": avg_complexity,
+        "maintainability_index": maintainability,
+        "comment_density": comment_density,
+        "type_hint_coverage": type_hint_coverage,
+        "function_count": function_count,
+        "avg_function_length": avg_function_length,
+        "loc": loc,
+        "total_functions": total_functions,
+    }
 
-    # Lint warnings
-    lint_warnings = run_pylint(path)
-    normalized_loc = max(loc, 1)
-    lint_per_100 = (lint_warnings / normalized_loc) * 100
 
-    metrics.update(
-        {
-            "cyclomatic_complexity": avg_complexity,
-            "maintainability_index": maintainability,
-            "lint_warnings": lint_warnings,
-            "lint_warnings_per_100_loc": lint_per_100,
-            "comment_density": comment_density,
-            "type_hint_coverage": type_hint_coverage,
-            "function_count": function_count,
-            "avg_function_length": avg_function_length,
-            "loc": loc,
-            "total_functions": total_functions,
-        }
-    )
-    return metrics
+def _source_key(source: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{METRICS_CACHE_VERSION}\0".encode("utf-8"))
+    digest.update(source.encode("utf-8", errors="surrogatepass"))
+    return digest.hexdigest()
 
 
-def map_metric(value: float, thresholds: List[Tuple[float, int]], reverse: bool = False) -> int:
-    """
-    thresholds: list of tuples (limit, score) sorted ascending if not reverse else descending.
-    reverse=False means value < limit -> score.
-    reverse=True means value > limit -> score.
+@lru_cache(maxsize=None)
+def private_dir(path: Path) -> bool:
+    """Create ``path`` readable by this user only; False if another user owns it.
+
+    Cache directories live in the shared temp directory, where anyone could have created them
+    first to plant entries.
     """
-    if reverse:
-        for limit, score in thresholds:
-            if value > limit:
-                return score
-        return thresholds[-1][1] if thresholds else 0
-    for limit, score in thresholds:
-        if value < limit:
-            return score
-    return thresholds[-1][1] if thresholds else 0
-
-
-def score_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
-    complexity_score = map_metric(
-        metrics["cyclomatic_complexity"],
-        [(10, 100), (20, 70), (float("inf"), 40)],
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = path.lstat()
+        if not stat.S_ISDIR(info.st_mode):
+            return False
+        if hasattr(os, "getuid") and info.st_uid != os.getuid():
+            return False
+        if info.st_mode & 0o077:
+            # Created by an earlier version with the default mode.
+            path.chmod(0o700)
+    except OSError:
+        return False
+    return True
+
+
+def valid_metrics(metrics: Any) -> bool:
+    return (
+        isinstance(metrics, dict)
+        and metrics.keys() == METRIC_FIELD_TYPES.keys()
+        and all(
+            isinstance(metrics[name], types) and not isinstance(metrics[name], bool)
+            for name, types in METRIC_FIELD_TYPES.items()
+        )
     )
 
-    maintainability = metrics["maintainability_index"]
-    if maintainability > 85:
-        maintainability_score = 100
-    elif maintainability > 70:
-        maintainability_score = 80
-    elif maintainability > 50:
-        maintainability_score = 60
-    else:
-        maintainability_score = 40
-
-    lint_score = 100
-    lint_metric = metrics["lint_warnings_per_100_loc"]
-    if lint_metric == 0:
-        lint_score = 100
-    elif lint_metric <= 5:
-        lint_score = 80
-    elif lint_metric <= 10:
-        lint_score = 60
-    else:
-        lint_score = 40
-
-    comment_density = metrics["comment_density"]
-    if comment_density >= 0.1:
-        comment_score = 100
-    elif comment_density >= 0.05:
-        comment_score = 80
-    elif comment_density >= 0.02:
-        comment_score = 60
-    else:
-        comment_score = 40
-
-    type_hint_cov = metrics["type_hint_coverage"]
-    if type_hint_cov >= 0.8:
-        hint_score = 100
-    elif type_hint_cov >= 0.5:
-        hint_score = 80
-    elif type_hint_cov >= 0.2:
-        hint_score = 60
-    else:
-        hint_score = 40
 
-    avg_func_len = metrics["avg_function_length"]
-    if avg_func_len < 30:
-        func_len_score = 100
-    elif avg_func_len <= 60:
-        func_len_score = 80
-    else:
-        func_len_score = 50
+def load_cached_metrics(key: str) -> Optional[Dict[str, Any]]:
+    if not private_dir(METRICS_CACHE_DIR):
+        return None
+    try:
+        metrics = json.loads((METRICS_CACHE_DIR / key[:2] / key).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    # Truncated or foreign entries are recomputed rather than failing the request.
+    return metrics if valid_metrics(metrics) else None
+
+
+def store_cached_metrics(key: str, metrics: Dict[str, Any]) -> None:
+    if not private_dir(METRICS_CACHE_DIR):
+        return
+    target = METRICS_CACHE_DIR / key[:2] / key
+    tmp_name = None
+    try:
+        target.parent.mkdir(mode=0o700, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(metrics, fh)
+        # Concurrent workers may write the same entry; the rename keeps readers consistent.
+        os.replace(tmp_name, target)
+    except OSError:  # pragma: no cover - the cache is best-effort
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+def _analyze_one(
+    path_str: str, repo_root: str, lint_warnings: int
+) -> Tuple[str, FileMetrics, FileScore]:
+    path = Path(path_str)
+    metrics = analyze_file(path, lint_warnings)
+    scored = score_metrics(metrics)
+    return str(path.relative_to(repo_root)), metrics, scored
+
+
+def _analyze_files(
+    executor: Executor, paths: List[str], repo_path: Path, lint_warnings: List[int]
+) -> List[Tuple[str, FileMetrics, FileScore]]:
+    return list(
+        executor.map(_analyze_one, paths, repeat(str(repo_path)), lint_warnings, chunksize=8)
+    )
+
+
+def map_metric(value: float, bands: Tuple[Tuple[float, ...], Tuple[int, ...], bool]) -> int:
+    """
+    bands: (limits, scores, inclusive) with limits ascending and one more score than limits.
+    inclusive=False means value < limit -> the score below that limit.
+    inclusive=True means value <= limit -> the score below that limit.
+    """
+    limits, scores, inclusive = bands
+    if inclusive:
+        return scores[bisect_left(limits, value)]
+    return scores[bisect_right(limits, value)]
+
+
+def _score_kernel(
+    complexity: float,
+    maintainability: float,
+    lint_metric: float,
+    comment_density: float,
+    type_hint_cov: float,
+    avg_func_len: float,
+) -> Tuple[int, int, int, int, int, int, int]:
+    """Score six scalar metrics; returns (final, maintainability, complexity, lint,
+    comment density, type hints, function length) scores."""
+    maintainability_score = map_metric(maintainability, MAINTAINABILITY_BANDS)
+    complexity_score = map_metric(complexity, COMPLEXITY_BANDS)
+    lint_score = map_metric(lint_metric, LINT_BANDS)
+    comment_score = map_metric(comment_density, COMMENT_BANDS)
+    hint_score = map_metric(type_hint_cov, TYPE_HINT_BANDS)
+    func_len_score = map_metric(avg_func_len, FUNCTION_LENGTH_BANDS)
 
     final_score = round(
         0.25 * maintainability_score
@@ -295,6 +626,38 @@ def score_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
         + 0.1 * hint_score
         + 0.15 * func_len_score
     )
+    return (
+        final_score,
+        maintainability_score,
+        complexity_score,
+        lint_score,
+        comment_score,
+        hint_score,
+        func_len_score,
+    )
+
+
+def score_metrics(metrics: FileMetrics) -> FileScore:
+    maintainability = metrics.maintainability_index
+    comment_density = metrics.comment_density
+    type_hint_cov = metrics.type_hint_coverage
+    avg_func_len = metrics.avg_function_length
+    (
+        final_score,
+        maintainability_score,
+        complexity_score,
+        lint_score,
+        comment_score,
+        hint_score,
+        func_len_score,
+    ) = _score_kernel(
+        metrics.cyclomatic_complexity,
+        maintainability,
+        metrics.lint_warnings_per_100_loc,
+        comment_density,
+        type_hint_cov,
+        avg_func_len,
+    )
 
     if final_score >= 90:
         letter = "A"
@@ -311,26 +674,26 @@ def score_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
     if maintainability_score < 80:
         reasons.append(f"Maintainability index {maintainability:.1f}")
     if complexity_score < 80:
-        reasons.append(f"Average complexity {metrics['cyclomatic_complexity']:.1f}")
+        reasons.append(f"Average complexity {metrics.cyclomatic_complexity:.1f}")
     if lint_score < 80:
         reasons.append(
-            f"{metrics['lint_warnings']} lint warnings (~{metrics['lint_warnings_per_100_loc']:.1f}/100 LOC)"
+            f"{metrics.lint_warnings} lint warnings (~{metrics.lint_warnings_per_100_loc:.1f}/100 LOC)"
         )
     if comment_score < 80:
         reasons.append(f"Low comment density ({comment_density:.2f})")
-    if hint_score < 80 and metrics["total_functions"]:
+    if hint_score < 80 and metrics.total_functions:
         reasons.append(f"Type hints on {type_hint_cov*100:.0f}% of functions")
-    if func_len_score < 80 and metrics["function_count"]:
+    if func_len_score < 80 and metrics.function_count:
         reasons.append(f"Average function length {avg_func_len:.1f} LOC")
 
     if not reasons:
         reasons.append("Balanced metrics across complexity, lint, and documentation")
 
-    return {
-        "numeric_score": final_score,
-        "letter_grade": letter,
-        "reasons": "; ".join(reasons[:3]),
-        "components": {
+    return FileScore(
+        numeric_score=final_score,
+        letter_grade=letter,
+        reasons="; ".join(reasons[:3]),
+        components={
             "maintainability": maintainability_score,
             "complexity": complexity_score,
             "lint": lint_score,
@@ -338,15 +701,49 @@ def score_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
             "type_hints": hint_score,
             "function_length": func_len_score,
         },
-    }
+    )
+
+
+def requirement_lines(text: str) -> List[str]:
+    """Return the non-blank lines of a requirements file with comments removed."""
+    lines = []
+    for line in text.splitlines():
+        line = _REQUIREMENT_COMMENT_RE.sub("", line).strip()
+        if line:
+            lines.append(line)
+    return lines
 
 
 def run_pip_audit(requirements_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = requirements_path.read_bytes()
+    except OSError:
+        return None
+    lines = requirement_lines(data.decode("utf-8", errors="replace"))
+    # A placeholder file lists nothing to audit, so skip pip-audit's slow start-up.
+    if not lines:
+        return summarize_audit([])
+
+    # Options such as -r and -c pull in other files, which the key would not cover.
+    cacheable = not any(line.startswith("-") for line in lines)
+    key = hashlib.blake2b(data, digest_size=16).hexdigest()
+    payload = load_cached_audit(key) if cacheable else None
+    if payload is None:
+        payload = invoke_pip_audit(requirements_path)
+        if payload is None:
+            return None
+        if cacheable:
+            store_cached_audit(key, payload)
+    return summarize_audit(payload)
+
+
+def invoke_pip_audit(requirements_path: Path) -> Optional[List[Dict[str, Any]]]:
     try:
         completed = subprocess.run(
             ["pip-audit", "-r", str(requirements_path), "--format", "json"],
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            # Progress and log output is never read, so do not buffer it.
+            stderr=subprocess.DEVNULL,
             text=True,
             check=False,
         )
@@ -360,7 +757,10 @@ def run_pip_audit(requirements_path: Path) -> Optional[Dict[str, Any]]:
         payload = json.loads(completed.stdout or "[]")
     except json.JSONDecodeError:
         return None
+    return payload
 
+
+def summarize_audit(payload: List[Dict[str, Any]]) -> Dict[str, Any]:
     vulnerability_count = 0
     for item in payload:
         vulnerabilities = item.get("vulns") or []
@@ -380,28 +780,82 @@ def run_pip_audit(requirements_path: Path) -> Optional[Dict[str, Any]]:
     }
 
 
-def grade_repo(repo_url: str) -> Dict[str, Any]:
+def load_cached_audit(key: str) -> Optional[List[Dict[str, Any]]]:
+    if not private_dir(AUDIT_CACHE_DIR):
+        return None
+    path = AUDIT_CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime > AUDIT_CACHE_TTL:
+            return None
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, list) or not all(isinstance(item, dict) for item in payload):
+        return None
+    return payload
+
+
+def store_cached_audit(key: str, payload: List[Dict[str, Any]]) -> None:
+    if not private_dir(AUDIT_CACHE_DIR):
+        return
+    tmp_name = None
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=AUDIT_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh)
+        os.replace(tmp_name, AUDIT_CACHE_DIR / f"{key}.json")
+    except OSError:  # pragma: no cover - the cache is best-effort
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+def encode_results(results: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(results)
+    return json.dumps(results, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def grade_repo(repo_url: str, executor: Optional[Executor] = None) -> Dict[str, Any]:
     repo_url = repo_url.strip()
     if not repo_url:
         raise HTTPException(status_code=400, detail="Repository URL is required.")
 
-    repo_path = clone_repository(repo_url, CLONE_TARGET)
+    target = clone_target(repo_url)
+    with locked_clone(target):
+        repo_path = clone_repository(repo_url, target)
+        return grade_checkout(repo_url, repo_path, executor)
+
+
+def grade_checkout(
+    repo_url: str, repo_path: Path, executor: Optional[Executor] = None
+) -> Dict[str, Any]:
     results: Dict[str, Any] = {"files": {}}
     numeric_scores: List[int] = []
 
-    for path in repo_path.rglob("*.py"):
-        if any(part in SKIP_DIRS for part in path.parts):
-            continue
-        metrics = analyze_file(path)
-        scored = score_metrics(metrics)
-        relative_path = str(path.relative_to(repo_path))
+    paths = list(iter_py_files(repo_path))
+    # One Pylint run for the whole repository pays its startup cost once.
+    lint_counts = run_pylint(paths)
+    lint_warnings = [lint_counts.get(path, 0) for path in paths]
+
+    # Each file is measured and scored independently, so spread them over processes and keep
+    # only the repository-level aggregation here.
+    if executor is not None:
+        analyzed = _analyze_files(executor, paths, repo_path, lint_warnings)
+    else:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            analyzed = _analyze_files(pool, paths, repo_path, lint_warnings)
+
+    for relative_path, metrics, scored in analyzed:
         results["files"][relative_path] = {
-            "grade": scored["letter_grade"],
-            "score": scored["numeric_score"],
-            "reason": scored["reasons"],
-            "metrics": metrics,
+            "grade": scored.letter_grade,
+            "score": scored.numeric_score,
+            "reason": scored.reasons,
+            "metrics": asdict(metrics),
         }
-        numeric_scores.append(scored["numeric_score"])
+        numeric_scores.append(scored.numeric_score)
 
     if not results["files"]:
         raise HTTPException(status_code=404, detail="No Python files found in the repository.")
@@ -435,6 +889,21 @@ def grade_repo(repo_url: str) -> Dict[str, Any]:
     return results
 
 
+def warm_up(app: FastAPI) -> None:
+    # Load radon and the template now rather than in the first request.
+    compute_source_metrics("def f(x: int) -> int:\n    return x  # warm-up\n")
+    templates.get_template("index.html")
+    # Workers are forked on first use, after the warm-up, so they start with all of it loaded.
+    app.state.pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+def shut_down_pool(app: FastAPI) -> None:
+    pool = getattr(app.state, "pool", None)
+    if pool is not None:
+        # Queued analyses have no client left to answer, so do not wait for them.
+        pool.shutdown(cancel_futures=True)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request) -> HTMLResponse:
     return templates.TemplateResponse(
@@ -448,8 +917,23 @@ async def index(request: Request) -> HTMLResponse:
 
 @app.post("/analyze", response_class=HTMLResponse)
 async def analyze_repo(request: Request, repo_url: str = Form(...)) -> HTMLResponse:
-    analysis = await run_in_threadpool(grade_repo, repo_url)
+    pool = getattr(app.state, "pool", None)
+    try:
+        analysis = await run_in_threadpool(grade_repo, repo_url, pool)
+    except BrokenProcessPool as exc:
+        # A dead worker (e.g. killed for memory) breaks the shared pool for good, so replace it
+        # and let only this request fail.
+        if pool is not None and app.state.pool is pool:
+            app.state.pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise HTTPException(
+            status_code=503, detail="An analysis worker crashed; please try again."
+        ) from exc
     app.state.last_result = analysis
+    # Serialize once per analysis; /api/results serves these bytes until the next one.
+    app.state.last_result_bytes = encode_results(analysis)
+    digest = hashlib.blake2b(app.state.last_result_bytes, digest_size=8).hexdigest()
+    app.state.last_etag = f'"{digest}"'
     return templates.TemplateResponse(
         "index.html",
         {
@@ -460,11 +944,14 @@ async def analyze_repo(request: Request, repo_url: str = Form(...)) -> HTMLRespo
 
 
 @app.get("/api/results")
-async def api_results() -> Dict[str, Any]:
-    result = getattr(app.state, "last_result", None)
-    if not result:
+async def api_results(request: Request) -> Response:
+    body = getattr(app.state, "last_result_bytes", None)
+    if not body:
         raise HTTPException(status_code=404, detail="No analysis has been run yet.")
-    return result
+    etag = app.state.last_etag
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 if __name__ == "__main__":
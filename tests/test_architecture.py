@@ -1,3 +1,5 @@
+import ast
+
 from cq.analyzers.architecture import ArchitectureAnalyzer
 from cq.config import Config
 
@@ -34,3 +36,17 @@ def test_architecture_allows_valid_edges():
     violations = analyzer.analyze(files)
     assert violations == []
 
+
+def test_architecture_uses_precomputed_trees():
+    cfg = Config.from_dict({
+        "arch": {
+            "map": {"src/core": "core", "src/ui": "ui"},
+            "allowed_edges": [["core", "core"], ["ui", "ui"]],
+        }
+    })
+    analyzer = ArchitectureAnalyzer(cfg.arch)
+    files = {"src/ui/view.py": ""}
+    trees = {"src/ui/view.py": ast.parse("import src.core.service\n")}
+    violations = analyzer.analyze(files, trees)
+    assert [v.import_name for v in violations] == ["src.core.service"]
+
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from cq.analyzers import architecture
+from cq.analyzers.architecture import ArchitectureAnalyzer
+from cq.config import Config
+from cq.runner import Runner
+from cq.utils.cache import CACHE_FILE, ResultCache
+
+
+def test_result_cache_reuses_unchanged_files(tmp_path: Path, monkeypatch):
+    cfg = Config.from_dict({})
+    sources = {"src/core/bad.py": "import src.api.handlers\n"}
+    cache = ResultCache.for_config(tmp_path, cfg)
+    first = ArchitectureAnalyzer(cfg.arch).analyze(sources, cache=cache)
+    cache.save()
+    assert first
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached file was re-analyzed")
+
+    monkeypatch.setattr(architecture, "_analyze_one", fail)
+    warm = ResultCache.for_config(tmp_path, cfg)
+    assert ArchitectureAnalyzer(cfg.arch).analyze(sources, cache=warm) == first
+
+    changed = ResultCache.for_config(tmp_path, cfg)
+    with pytest.raises(AssertionError):
+        ArchitectureAnalyzer(cfg.arch).analyze({"src/core/bad.py": "import os\n"}, cache=changed)
+
+    other_cfg = Config.from_dict({"arch": {"map": {"src/core": "api"}}})
+    stale = ResultCache.for_config(tmp_path, other_cfg)
+    with pytest.raises(AssertionError):
+        ArchitectureAnalyzer(other_cfg.arch).analyze(sources, cache=stale)
+
+
+@pytest.mark.parametrize("garbage", ["garbage", [[-1], 1]])
+def test_malformed_cache_entries_are_recomputed(tmp_path_factory, garbage):
+    project_dir = tmp_path_factory.mktemp("proj")
+    (project_dir / "src" / "core").mkdir(parents=True)
+    (project_dir / "src" / "core" / "bad.py").write_text(
+        "import src.api.handlers\n\n\ndef f(x: int) -> int:\n    return x if x else 0\n",
+        encoding="utf-8",
+    )
+    config = Config.from_dict({})
+    first, _ = Runner(config).run(project_dir)
+    assert first.project.architecture_violations
+
+    cache_file = project_dir / config.cache.dir / CACHE_FILE
+    payload = json.loads(cache_file.read_text(encoding="utf-8"))
+    assert payload["entries"]
+    payload["entries"] = {key: garbage for key in payload["entries"]}
+    cache_file.write_text(json.dumps(payload), encoding="utf-8")
+
+    second, _ = Runner(config).run(project_dir)
+    assert second.files == first.files
+    assert second.project.architecture_violations == first.project.architecture_violations
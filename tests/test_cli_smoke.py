@@ -2,6 +2,8 @@ import json
 from pathlib import Path
 
 from cq.cli import main
+from cq.config import Config
+from cq.runner import Runner
 
 
 def test_cli_smoke(tmp_path: Path, monkeypatch):
@@ -15,3 +17,34 @@ def test_cli_smoke(tmp_path: Path, monkeypatch):
     assert "files" in data
     assert data["project"]["summary"]["grade"] >= 0
 
+
+def test_runner_parallel_matches_serial(tmp_path: Path):
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    (project_dir / "a.py").write_text("def add(a: int, b):\n    return a + b\n", encoding="utf-8")
+    (project_dir / "b.py").write_text("def f(x):\n    if x:\n        return 1\n", encoding="utf-8")
+    (project_dir / "broken.py").write_text("def f(:\n", encoding="utf-8")
+    reports = []
+    for jobs in (1, 2):
+        config = Config.from_dict({"tools": {"jobs": jobs}, "cache": {"enabled": False}})
+        report, _ = Runner(config).run(project_dir)
+        reports.append(report.files)
+    assert reports[0] == reports[1]
+
+
+def test_runner_skips_ast_for_zero_weight_roles(tmp_path_factory):
+    # Roles are detected from absolute paths, so keep the test name out of the project path.
+    project_dir = tmp_path_factory.mktemp("proj")
+    (project_dir / "tests").mkdir()
+    source = "def f(x: int) -> int:\n    if x:\n        return 1\n    return 0\n"
+    (project_dir / "mod.py").write_text(source, encoding="utf-8")
+    (project_dir / "tests" / "test_mod.py").write_text(source, encoding="utf-8")
+    config = Config.from_dict({"weights": {"roles": {"test": 0.0}}, "cache": {"enabled": False}})
+    report, _ = Runner(config).run(project_dir)
+    files = {f.path: f for f in report.files}
+    skipped = files[str(Path("tests") / "test_mod.py")]
+    assert files["mod.py"].metrics.cognitive_complexity > 0
+    assert skipped.metrics.cognitive_complexity == 0
+    assert skipped.metrics.annotation_coverage == 0.0
+    assert skipped.loc == files["mod.py"].loc
+    assert "not parsed: role weight is zero" in skipped.missing_reasons
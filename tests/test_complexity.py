@@ -14,3 +14,26 @@ def test_complexity_increases_with_branches():
     assert result.raw["complex.py"] > result.raw["simple.py"]
     assert result.scores["complex.py"] <= result.scores["simple.py"]
 
+
+def test_complexity_nesting_penalties():
+    cfg = Config.from_dict({})
+    analyzer = ComplexityAnalyzer(cfg)
+    source = (
+        "def f(items):\n"
+        "    for item in items:\n"
+        "        if item and item.ok or item.forced:\n"
+        "            return 1\n"
+        "        elif item is None:\n"
+        "            continue\n"
+        "        else:\n"
+        "            try:\n"
+        "                item.run()\n"
+        "            except ValueError:\n"
+        "                pass\n"
+        "            finally:\n"
+        "                item.close()\n"
+        "    return 0\n"
+    )
+    result = analyzer.analyze({"nested.py": source}, {"nested.py": 14})
+    assert result.raw["nested.py"] == 23
+
@@ -1,5 +1,7 @@
+from cq.analyzers import duplication
 from cq.analyzers.duplication import DuplicationAnalyzer
 from cq.config import Config
+from cq.utils.file_scan import scan
 
 
 def test_duplication_detects_overlap():
@@ -25,3 +27,56 @@ def test_duplication_handles_unique():
     assert result.ratios["a.py"] == 0
     assert result.ratios["b.py"] == 0
 
+
+def test_duplication_parallel_matches_serial():
+    from concurrent.futures import ProcessPoolExecutor
+
+    cfg = Config.from_dict({})
+    analyzer = DuplicationAnalyzer(cfg.duplication)
+    sources = {
+        "a.py": "def add(x, y):\n    return x + y\n",
+        "b.py": "def add_numbers(a, b):\n    return a + b\n",
+        "c.py": "def mul(a, b):\n    return a * b\n",
+    }
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = analyzer.analyze(sources, executor)
+    assert parallel == analyzer.analyze(sources)
+
+
+def test_normalize_tokens():
+    cfg = Config.from_dict({})
+    analyzer = DuplicationAnalyzer(cfg.duplication)
+    tokens, success = analyzer._normalize("if x is None:\n    y = foo(1, 'a')  # note\n")
+    assert success
+    assert tokens == ["if", "ID", "is", "CONST", ":", "ID", "=", "ID", "(", "CONST", ",", "CONST", ")"]
+
+
+def test_file_scan_feeds_loc_and_tokens():
+    cfg = Config.from_dict({})
+    analyzer = DuplicationAnalyzer(cfg.duplication)
+    text = "x = 1\n\ny = (x,\n     2)\n"
+    scanned = scan(text)
+    assert scanned.success
+    assert scanned.loc == 4
+    assert analyzer._normalize(text, scanned) == analyzer._normalize(text)
+    broken = scan("x = (\n")
+    assert not broken.success
+    assert broken.loc == 1
+
+
+def test_identical_sources_are_analyzed_once(monkeypatch):
+    calls = []
+    analyze_one = duplication._analyze_one
+
+    def counting(analyzer, text, scan=None):
+        calls.append(text)
+        return analyze_one(analyzer, text, scan)
+
+    monkeypatch.setattr(duplication, "_analyze_one", counting)
+    analyzer = DuplicationAnalyzer(Config.from_dict({}).duplication)
+    copy = "def add(x, y):\n    return x + y\n"
+    sources = {"a/__init__.py": "", "b/__init__.py": "", "a/m.py": copy, "b/m.py": copy}
+    result = analyzer.analyze(sources)
+    assert sorted(calls) == sorted(["", copy])
+    assert result.fingerprints["a/m.py"] == result.fingerprints["b/m.py"]
+    assert result.ratios["b/m.py"] == 1.0
@@ -1,3 +1,4 @@
+import io
 import subprocess
 from pathlib import Path
 from unittest import mock
@@ -14,16 +15,37 @@ class DummyCompletedProcess:
         self.returncode = returncode
 
 
+class DummyPopen:
+    def __init__(self, stdout: str = "", returncode: int = 0):
+        self.stdout = io.StringIO(stdout)
+        self.returncode = returncode
+
+    def kill(self):
+        pass
+
+    def wait(self):
+        return self.returncode
+
+
 def test_lint_analyzer_parses_messages(tmp_path: Path):
     cfg = Config.from_dict({})
     analyzer = LintAnalyzer(cfg)
     message = [{"path": str(tmp_path / "mod.py"), "symbol": "C0103"}]
-    with mock.patch("subprocess.run", return_value=DummyCompletedProcess(stdout=json_dumps(message), returncode=2)):
+    with mock.patch("subprocess.Popen", return_value=DummyPopen(stdout=json_dumps(message), returncode=2)):
         result = analyzer.analyze([str(tmp_path / "mod.py")])
     assert result.counts[str(tmp_path / "mod.py")]["C"] == 1
     assert result.weighted_scores[str(tmp_path / "mod.py")] < 100
 
 
+def test_iter_json_array_reads_across_chunks():
+    from cq.analyzers.lint import _iter_json_array
+
+    messages = [{"path": f"m{i}.py", "symbol": "W0611"} for i in range(50)]
+    stream = io.StringIO(json_dumps(messages))
+    assert list(_iter_json_array(stream, chunk_size=7)) == messages
+    assert list(_iter_json_array(io.StringIO(""))) == []
+
+
 def json_dumps(data):
     import json
 
@@ -33,10 +55,20 @@ def json_dumps(data):
 def test_typing_analyzer_parses_errors(tmp_path: Path):
     cfg = Config.from_dict({})
     analyzer = TypingAnalyzer(cfg)
-    fake_output = f"{tmp_path / 'mod.py'}:1: error: Incompatible types\n"
+    fake_output = f"{tmp_path / 'mod.py'}:1: error: Incompatible types\n".encode()
     loc_map = {str(tmp_path / "mod.py"): 10}
     with mock.patch("subprocess.run", return_value=DummyCompletedProcess(stdout=fake_output, returncode=1)):
         result = analyzer.analyze([str(tmp_path / "mod.py")], loc_map, {str(tmp_path / "mod.py"): 0.0})
     assert result.errors[str(tmp_path / "mod.py")] == 1
     assert result.scores[str(tmp_path / "mod.py")] < 100
 
+
+def test_typing_analyzer_uses_dmypy_run(tmp_path: Path):
+    cfg = Config.from_dict({"tools": {"mypy_cmd": "dmypy"}})
+    analyzer = TypingAnalyzer(cfg)
+    with mock.patch("subprocess.run", return_value=DummyCompletedProcess(stdout=b"", returncode=0)) as run:
+        analyzer.analyze([str(tmp_path / "mod.py")], {}, {})
+    cmd = run.call_args.args[0]
+    assert cmd[:3] == ["dmypy", "run", "--"]
+    assert cmd[-1] == str(tmp_path / "mod.py")
+
@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("git")
+pytest.importorskip("radon")
+
+import main  # noqa: E402
+
+
+def test_comment_density_ignores_hashes_in_strings():
+    source = 'x = "# not a comment"  # one\n# two\ny = """\n# still a string\n"""\n'
+    assert main.compute_comment_density(source) == (5, 2 / 5)
+
+
+def test_unterminated_literals_run_to_end_of_line_or_file():
+    # An unterminated quote swallows the rest of its line, and an unterminated triple quote
+    # the rest of the file, instead of being rescanned from every later quote.
+    source = "# before\nx = '" + "\\'" * 40000 + "  # swallowed\n" + "\\'''\n# gone\n" * 100
+    assert main.compute_comment_density(source) == (202, 1 / 202)
@@ -0,0 +1,66 @@
+import pytest
+
+from cq.reporting.schema import (
+    FILE_SCHEMA_VALIDATE,
+    ReportValidationError,
+    compile_accessors,
+    compile_schema,
+)
+
+
+def _file_entry():
+    return {
+        "path": "pkg/mod.py",
+        "loc": 10,
+        "role": "default",
+        "metrics": {
+            "duplication_ratio": 0.0,
+            "lint": {"C": 1, "W": 0, "R": 0, "E": 0, "weighted_score": 99.75},
+            "typing": {"mypy_errors": 0, "annotation_coverage": 0.5, "score": 100.0},
+            "complexity": {"cognitive": 2, "per_loc": 0.2, "score": 20.0},
+        },
+        "grade": 80.0,
+        "confidence": {"overall": 0.5},
+        "missing_reasons": [],
+    }
+
+
+def test_compiled_schema_accepts_and_locates_errors():
+    entry = _file_entry()
+    FILE_SCHEMA_VALIDATE(entry)
+    entry["metrics"]["lint"]["weighted_score"] = 100.5
+    with pytest.raises(ReportValidationError, match=r"\.metrics\.lint\.weighted_score"):
+        FILE_SCHEMA_VALIDATE(entry)
+    entry = _file_entry()
+    entry["role"] = "unknown"
+    with pytest.raises(ReportValidationError, match="not one of"):
+        FILE_SCHEMA_VALIDATE(entry)
+    entry = _file_entry()
+    del entry["grade"]
+    with pytest.raises(ReportValidationError, match="'grade' is a required property"):
+        FILE_SCHEMA_VALIDATE(entry)
+
+
+def test_compile_schema_rejects_unsupported_keywords():
+    validate = compile_schema({"type": "array", "items": {"type": "integer"}, "maxItems": 2})
+    validate([1, 2.0])
+    with pytest.raises(ReportValidationError, match=r"\[1\]"):
+        validate([1, True])
+    with pytest.raises(ValueError, match="unsupported schema keyword"):
+        compile_schema({"type": "string", "pattern": "^a"})
+
+
+def test_compile_accessors_validates_objects_in_place():
+    schema = {
+        "type": "object",
+        "required": ["inner"],
+        "properties": {
+            "inner": {"type": "object", "properties": {"score": {"type": "number", "maximum": 1}}}
+        },
+    }
+    validate = compile_accessors(schema, {("inner", "score"): lambda obj: obj["score"]})
+    validate({"score": 0.5})
+    with pytest.raises(ReportValidationError, match=r"\.inner\.score"):
+        validate({"score": 2})
+    with pytest.raises(ValueError, match="no accessor"):
+        compile_accessors(schema, {})